@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from fastapi import Request
+
+
+CacheKey = Tuple[str, Hashable]
+# An entry as a response saw it: its scope, key and expiry, which changes whenever it is set.
+CacheSource = Tuple[str, Hashable, float]
+
+_sources: ContextVar[Optional[List[CacheSource]]] = ContextVar("read_cache_sources", default=None)
+
+
+@contextmanager
+def track_sources() -> Iterator[List[CacheSource]]:
+    """Collect the entries read from or written to any ReadCache while the block runs."""
+    sources: List[CacheSource] = []
+    token = _sources.set(sources)
+    try:
+        yield sources
+    finally:
+        _sources.reset(token)
+
+
+def _record(scope: str, key: Hashable, expires_at: float) -> None:
+    sources = _sources.get()
+    if sources is not None:
+        sources.append((scope, key, expires_at))
+
+
+def cache_scope(access_token: str, user_id: Optional[str] = None) -> str:
+    """Scope cache entries to the user, so a write from any of their sessions invalidates them.
+
+    ``user_id`` must come from a verified token. Without one, entries are scoped to the
+    credential PostgREST authorised the original read with.
+    """
+    if user_id:
+        return f"user:{user_id}"
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+class ReadCache:
+    """In-process TTL + LRU cache for list responses, invalidated per scope on writes.
+
+    A cached value must be the whole of the response it is served as: ETagMiddleware answers
+    304 without running the endpoint for as long as the entries a response came from are
+    current.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._scopes: Dict[str, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, scope: str, key: Hashable) -> Optional[Any]:
+        entry_key = (scope, key)
+        entry = self._entries.get(entry_key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(entry_key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(entry_key)
+        self.hits += 1
+        _record(scope, key, expires_at)
+        return value
+
+    def set(self, scope: str, key: Hashable, value: Any) -> None:
+        entry_key = (scope, key)
+        expires_at = time.monotonic() + self._ttl
+        self._entries[entry_key] = (expires_at, value)
+        self._entries.move_to_end(entry_key)
+        _record(scope, key, expires_at)
+        self._scopes.setdefault(scope, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def is_current(self, source: CacheSource) -> bool:
+        """Whether the entry is unexpired and has not been replaced or dropped since."""
+        scope, key, expires_at = source
+        entry = self._entries.get((scope, key))
+        return entry is not None and entry[0] == expires_at and expires_at > time.monotonic()
+
+    def invalidate(self, scope: str) -> None:
+        keys = self._scopes.pop(scope, None)
+        if not keys:
+            return
+        for key in keys:
+            self._entries.pop((scope, key), None)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._scopes.clear()
+
+    def _remove(self, entry_key: CacheKey) -> None:
+        self._entries.pop(entry_key, None)
+        scope, key = entry_key
+        keys = self._scopes.get(scope)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[scope]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl": self._ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def get_read_cache(request: Request) -> Optional[ReadCache]:
+    return getattr(request.app.state, "read_cache", None)
+
+
+__all__ = ["CacheSource", "ReadCache", "cache_scope", "get_read_cache", "track_sources"]
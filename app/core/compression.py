@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import zlib
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:  # optional: pip install zstandard
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far without ending the stream."""
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._obj = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+def available_encodings() -> List[str]:
+    encodings = ["gzip"]
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    return encodings
+
+
+def make_encoder(encoding: str, levels: Dict[str, int]) -> _Encoder:
+    if encoding == "br":
+        return _BrotliEncoder(levels["br"])
+    if encoding == "zstd":
+        return _ZstdEncoder(levels["zstd"])
+    return _GzipEncoder(levels["gzip"])
+
+
+def negotiate_encoding(accept_encoding: str, preference: Sequence[str]) -> Optional[str]:
+    """Pick the acceptable encoding with the highest q-value, ties broken by ``preference``."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in preference:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli/zstd response compression that keeps streamed bodies streaming."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        content_types: Sequence[str] = ("application/json",),
+        encodings: Sequence[str] = ("br", "zstd", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types)
+        supported = available_encodings()
+        self.encodings = [encoding for encoding in encodings if encoding in supported]
+        self.levels = {"gzip": 6, "br": 4, "zstd": 3, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Message] = None
+        self.chunks: List[bytes] = []
+        self.buffered = 0
+        self.encoder: Optional[_Encoder] = None
+        self.sized = False
+        self.passthrough = False
+
+    def _compressible(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        return (
+            message["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and content_type in self.middleware.content_types
+        )
+
+    def _start_headers(self, content_length: Optional[int]) -> Dict[str, Any]:
+        assert self.start is not None
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed bytes differ from the tagged ones; only weak equality holds.
+            headers["ETag"] = f"W/{etag}"
+        if content_length is None:
+            del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return {**self.start, "headers": headers.raw}
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            if self._compressible(message):
+                self.start = message
+                # A declared length means a complete body (possibly re-chunked by an inner
+                # middleware): buffer it and compress once instead of streaming.
+                self.sized = "content-length" in Headers(raw=message["headers"])
+            else:
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is not None:
+            data = self.encoder.compress(body)
+            data += self.encoder.flush() if more_body else self.encoder.finish()
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.chunks.append(body)
+        self.buffered += len(body)
+        if more_body and (self.sized or self.buffered < self.middleware.minimum_size):
+            return
+        if self.buffered < self.middleware.minimum_size:
+            # Whole body is below the threshold: send it untouched.
+            assert self.start is not None
+            self.passthrough = True
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": b"".join(self.chunks)})
+            return
+
+        buffered = b"".join(self.chunks)
+        self.chunks = []
+        self.encoder = make_encoder(self.encoding, self.middleware.levels)
+        if more_body:
+            data = self.encoder.compress(buffered) + self.encoder.flush()
+            await self._send(self._start_headers(content_length=None))
+        else:
+            data = self.encoder.compress(buffered) + self.encoder.finish()
+            await self._send(self._start_headers(content_length=len(data)))
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+__all__ = ["CompressionMiddleware", "available_encodings", "make_encoder", "negotiate_encoding"]
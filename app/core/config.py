@@ -1,8 +1,8 @@
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 import json
 
-from pydantic import AnyHttpUrl, Field, field_validator
+from pydantic import AnyHttpUrl, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict, EnvSettingsSource
 
 
@@ -18,6 +18,9 @@ class SafeEnvSettingsSource(EnvSettingsSource):
             return value
 
 
+DEVELOPMENT_ENVS = ("dev", "development", "local", "test")
+
+
 class Settings(BaseSettings):
     app_env: str = "dev"
     app_port: int = 8080
@@ -28,7 +31,65 @@ class Settings(BaseSettings):
     refresh_cookie_name: str = "sb-refresh-token"
     log_level: str = "INFO"
     rate_limit: str = "100/minute"
+    rate_limit_storage_uri: str = "memory://"
+    rate_limit_per_ip: Optional[str] = "600/minute"
+    rate_limit_list: Optional[str] = "60/minute"
+    rate_limit_search: Optional[str] = "30/minute"
+    rate_limit_export: Optional[str] = "5/minute"
+    rate_limit_batch: Optional[str] = "30/minute"
     request_timeout: float = 10.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 5.0
+    http2: bool = False
+    http_connect_timeout: Optional[float] = None
+    http_read_timeout: Optional[float] = None
+    http_write_timeout: Optional[float] = None
+    http_pool_timeout: Optional[float] = None
+    upstream_retries: int = 2
+    upstream_retry_backoff: float = 0.1
+    upstream_retry_max_backoff: float = 2.0
+    upstream_retry_after_max: float = 5.0
+    circuit_failure_threshold: float = 0.5
+    circuit_min_calls: int = 20
+    circuit_window: float = 30.0
+    circuit_reset_timeout: float = 15.0
+    stale_fallback_ttl: float = 300.0
+    stale_fallback_max_entries: int = 500
+    metrics_enabled: bool = True
+    # Exposes upstream timings to every client; unset means on only in development envs.
+    server_timing_enabled: Optional[bool] = None
+    hedge_reads: bool = False
+    hedge_percentile: float = 0.95
+    hedge_budget: float = 0.05
+    hedge_min_delay: float = 0.05
+    hedge_min_samples: int = 20
+    # Off: rate limits bucket by the token's unverified session_id claim, not its sub.
+    jwt_local_verification: bool = False
+    jwt_secret: Optional[str] = None
+    jwt_audience: str = "authenticated"
+    jwt_leeway: int = 0
+    jwks_cache_ttl: float = 600.0
+    token_refresh_leeway: int = 60
+    token_refresh_reuse_ttl: float = 10.0
+    read_cache_ttl: float = 30.0
+    read_cache_max_entries: int = 1000
+    coalesce_reads: bool = True
+    clients_count_strategy: Literal["exact", "planned", "estimated", "none"] = "exact"
+    tasks_count_strategy: Literal["exact", "planned", "estimated", "none"] = "exact"
+    etag_enabled: bool = True
+    upstream_validation: Literal["per_row", "list", "json"] = "json"
+    postgrest_aggregates: bool = False
+    batch_max_concurrency: int = 4
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_content_types: List[str] = Field(
+        default_factory=lambda: ["application/json", "application/x-ndjson", "text/csv"]
+    )
+    compression_encodings: List[str] = Field(default_factory=lambda: ["br", "zstd", "gzip"])
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    zstd_level: int = 3
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -53,7 +114,9 @@ class Settings(BaseSettings):
             file_secret_settings,
         )
 
-    @field_validator("allowed_origins", mode="before")
+    @field_validator(
+        "allowed_origins", "compression_content_types", "compression_encodings", mode="before"
+    )
     @classmethod
     def parse_allowed_origins(cls, value: str | List[str] | None):
         if value in (None, ""):
@@ -79,6 +142,12 @@ class Settings(BaseSettings):
 
         return []
 
+    @model_validator(mode="after")
+    def default_server_timing(self) -> "Settings":
+        if self.server_timing_enabled is None:
+            self.server_timing_enabled = self.app_env.lower() in DEVELOPMENT_ENVS
+        return self
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -1,16 +1,23 @@
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
 
 class AppError(Exception):
-    def __init__(self, detail: str, code: str = "internal_error", status_code: int = 500):
+    def __init__(
+        self,
+        detail: str,
+        code: str = "internal_error",
+        status_code: int = 500,
+        headers: Optional[Dict[str, str]] = None,
+    ):
         super().__init__(detail)
         self.detail = detail
         self.code = code
         self.status_code = status_code
+        self.headers = headers
 
 
 def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
@@ -20,7 +27,7 @@ def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
         "code": exc.code,
         "request_id": request_id,
     }
-    return JSONResponse(status_code=exc.status_code, content=payload)
+    return JSONResponse(status_code=exc.status_code, content=payload, headers=exc.headers)
 
 
 def unhandled_error_handler(request: Request, exc: Exception) -> JSONResponse:
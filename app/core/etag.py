@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import CacheSource, ReadCache, track_sources
+
+# JSON bodies up to this size are buffered and hashed; larger ones pass through untagged.
+MAX_BUFFERED_BODY = 4 * 1024 * 1024
+# Validators remembered for responses served from the read cache, least recently used first.
+MAX_VALIDATORS = 1024
+
+RequestKey = Tuple[str, str, bytes, bytes]
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as RFC 9110 requires for If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+
+class ETagMiddleware:
+    """Adds a strong ETag to buffered JSON GET responses and answers 304 on a match.
+
+    When a response was built from read-cache entries, its tag is remembered for the same
+    path, query and cookies. A matching If-None-Match is then answered before the endpoint
+    runs, for as long as those entries are current.
+    """
+
+    def __init__(self, app: ASGIApp, max_validators: int = MAX_VALIDATORS):
+        self.app = app
+        self._max_validators = max_validators
+        self._validators: "OrderedDict[RequestKey, Tuple[str, Tuple[CacheSource, ...]]]" = (
+            OrderedDict()
+        )
+
+    def _known_etag(self, key: RequestKey, cache: Optional[ReadCache]) -> Optional[str]:
+        known = self._validators.get(key)
+        if known is None:
+            return None
+        etag, sources = known
+        if cache is None or not all(cache.is_current(source) for source in sources):
+            del self._validators[key]
+            return None
+        self._validators.move_to_end(key)
+        return etag
+
+    def _remember(self, key: RequestKey, etag: str, sources: List[CacheSource]) -> None:
+        if not sources:
+            self._validators.pop(key, None)
+            return
+        self._validators[key] = (etag, tuple(sources))
+        self._validators.move_to_end(key)
+        while len(self._validators) > self._max_validators:
+            self._validators.popitem(last=False)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        cache: Optional[ReadCache] = getattr(
+            getattr(scope.get("app"), "state", None), "read_cache", None
+        )
+        request_key: RequestKey = (
+            scope["method"],
+            scope["path"],
+            scope.get("query_string", b""),
+            hashlib.sha256(request_headers.get("cookie", "").encode()).digest(),
+        )
+        if if_none_match:
+            known = self._known_etag(request_key, cache)
+            if known is not None and etag_matches(if_none_match, known):
+                headers = MutableHeaders()
+                headers["ETag"] = known
+                headers["Cache-Control"] = "private, no-cache"
+                await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        buffered = 0
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, buffered, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    message["status"] != 200
+                    or "etag" in headers
+                    or not content_type.startswith("application/json")
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            assert start is not None
+            chunks.append(message.get("body", b""))
+            buffered += len(chunks[-1])
+            if message.get("more_body", False):
+                if buffered > MAX_BUFFERED_BODY:
+                    # Too large to hash in memory: flush what we have and stream the rest.
+                    passthrough = True
+                    await send(start)
+                    await send({**message, "body": b"".join(chunks)})
+                return
+
+            body = b"".join(chunks)
+            etag = compute_etag(body)
+            self._remember(request_key, etag, sources)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers["ETag"] = etag
+            headers.setdefault("Cache-Control", "private, no-cache")
+            if if_none_match and etag_matches(if_none_match, etag):
+                del headers["content-length"]
+                del headers["content-type"]
+                await send({**start, "status": 304, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": body})
+
+        with track_sources() as sources:
+            await self.app(scope, receive, send_wrapper)
+
+
+__all__ = ["ETagMiddleware", "compute_etag", "etag_matches"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import bisect
+import re
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Requests that matched no route share one label value so arbitrary paths cannot add series.
+UNMATCHED_ROUTE = "unmatched"
+
+Labels = Tuple[str, ...]
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative, last is +Inf), sum]
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bucket_names = self.label_names + ("le",)
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = _format_labels(bucket_names, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(self.value)}",
+        ]
+
+
+def render_stats(prefix: str, stats: Optional[Mapping[str, Any]]) -> List[str]:
+    """Flatten a ``stats()`` dict into untyped samples, e.g. ``bff_pool_requests 12``."""
+    lines: List[str] = []
+    for key, value in (stats or {}).items():
+        name = _INVALID_NAME_CHARS.sub("_", f"{prefix}_{key}")
+        if isinstance(value, Mapping):
+            lines.extend(render_stats(name, value))
+        elif isinstance(value, (int, float)):
+            lines.extend([f"# TYPE {name} untyped", f"{name} {_format_value(value)}"])
+    return lines
+
+
+class Metrics:
+    """Process-wide request and upstream metrics rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.http_requests = Histogram(
+            "bff_http_request_duration_seconds",
+            "Inbound request latency by route template and status.",
+            ("method", "route", "status"),
+            buckets,
+        )
+        self.http_in_flight = Gauge("bff_http_requests_in_flight", "Inbound requests in flight.")
+        self.upstream_requests = Histogram(
+            "bff_upstream_request_duration_seconds",
+            "Supabase request latency by operation, table, method and outcome.",
+            ("operation", "table", "method", "status"),
+            buckets,
+        )
+
+    def observe_upstream(
+        self, operation: str, table: str, method: str, status: str, seconds: float
+    ) -> None:
+        self.upstream_requests.observe((operation, table, method.upper(), status), seconds)
+
+    def render(self, stats: Optional[Mapping[str, Any]] = None) -> str:
+        lines: List[str] = []
+        for metric in (self.http_requests, self.http_in_flight, self.upstream_requests):
+            lines.extend(metric.render())
+        for prefix, values in (stats or {}).items():
+            lines.extend(render_stats(f"bff_{prefix}", values))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and labels it with the matched route template."""
+
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.metrics.http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.http_in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.metrics.http_requests.observe(
+                (scope["method"], template, str(status)), time.perf_counter() - started
+            )
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Gauge",
+    "Histogram",
+    "Metrics",
+    "MetricsMiddleware",
+    "render_stats",
+]
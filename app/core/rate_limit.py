@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+import jwt
+from fastapi import Request
+from limits import RateLimitItem, parse_many
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+from .cache import cache_scope
+from .config import Settings
+from .errors import AppError, app_error_handler
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "bff"
+
+
+def _unverified_session_id(token: str) -> Optional[str]:
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return None
+    session_id = claims.get("session_id")
+    return session_id if isinstance(session_id, str) else None
+
+
+def make_rate_limit_key(settings: Settings) -> Callable[[Request], str]:
+    """Bucket requests by user rather than by address, so clients behind one NAT stay apart."""
+
+    def rate_limit_key(request: Request) -> str:
+        token = request.cookies.get(settings.jwt_cookie_name)
+        if not token:
+            return f"ip:{get_remote_address(request)}"
+        verifier = getattr(request.app.state, "token_verifier", None)
+        claims = verifier.verify_cached(token) if verifier is not None else None
+        if claims and claims.get("sub"):
+            return f"user:{claims['sub']}"
+        # Not verifiable without a network call. Bucket by the session the token claims, which
+        # survives refreshes, falling back to the credential itself. Forging either to get
+        # fresh buckets is still bounded by the per-address ceiling, and another user's
+        # session id is not guessable.
+        session_id = _unverified_session_id(token)
+        if session_id:
+            return f"session:{cache_scope(session_id)}"
+        return f"token:{cache_scope(token)}"
+
+    return rate_limit_key
+
+
+def build_limiter(settings: Settings) -> Limiter:
+    shared_storage = not settings.rate_limit_storage_uri.startswith("memory://")
+    return Limiter(
+        key_func=make_rate_limit_key(settings),
+        default_limits=[settings.rate_limit],
+        storage_uri=settings.rate_limit_storage_uri,
+        # If the shared store goes away, keep limiting per process rather than failing requests.
+        in_memory_fallback_enabled=shared_storage,
+        key_prefix=KEY_PREFIX,
+        key_style="endpoint",
+    )
+
+
+def route_limits(settings: Settings) -> Dict[str, str]:
+    return {
+        "ip": settings.rate_limit_per_ip,
+        "list": settings.rate_limit_list,
+        "search": settings.rate_limit_search,
+        "export": settings.rate_limit_export,
+        "batch": settings.rate_limit_batch,
+    }
+
+
+def _retry_after(limiter: Limiter, item: RateLimitItem, keys: List[str]) -> Dict[str, str]:
+    try:
+        reset_at, _ = limiter.limiter.get_window_stats(item, *keys)
+    except Exception:  # pragma: no cover - storage outage
+        return {}
+    return {"Retry-After": str(max(1, int(reset_at - time.time()) + 1))}
+
+
+def _rate_limited(detail: str, headers: Dict[str, str]) -> AppError:
+    return AppError(
+        f"Rate limit exceeded: {detail}", code="rate_limited", status_code=429, headers=headers
+    )
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    headers: Dict[str, str] = {}
+    current = getattr(request.state, "view_rate_limit", None)
+    if current is not None:
+        headers = _retry_after(request.app.state.limiter, current[0], current[1])
+    return app_error_handler(request, _rate_limited(exc.detail, headers))
+
+
+def _hit(limiter: Limiter, item: RateLimitItem, keys: List[str]) -> bool:
+    try:
+        return limiter.limiter.hit(item, *keys)
+    except Exception:
+        if not limiter._in_memory_fallback_enabled or limiter._storage_dead:
+            raise
+        # The same switch slowapi makes when its own limits hit a dead store; its middleware
+        # flips back to the shared storage once that answers again.
+        logger.warning("Rate limit storage unreachable - falling back to in-memory storage")
+        limiter._storage_dead = True
+        return limiter.limiter.hit(item, *keys)
+
+
+def _enforce(request: Request, name: str, key: str) -> None:
+    limiter: Optional[Limiter] = getattr(request.app.state, "limiter", None)
+    value = getattr(request.app.state, "route_limits", {}).get(name)
+    if limiter is None or not limiter.enabled or not value:
+        return
+    keys = [KEY_PREFIX, key, f"route:{name}"]
+    for item in parse_many(value):
+        try:
+            allowed = _hit(limiter, item, keys)
+        except Exception:
+            logger.warning("Rate limit storage unavailable; skipping %s limit", name)
+            return
+        if not allowed:
+            raise _rate_limited(str(item), _retry_after(limiter, item, keys))
+
+
+def route_limit(
+    name: str, when: Optional[Callable[[Request], bool]] = None
+) -> Callable[[Request], None]:
+    """Dependency enforcing a named per-route limit on top of the global defaults.
+
+    slowapi's middleware only evaluates default and application limits; its per-route limits
+    need a decorator bound to a limiter at import time. This shares the limiter's storage
+    instead, with limits configured per app in ``app.state.route_limits`` and requests keyed
+    by ``app.state.rate_limit_key``.
+    """
+
+    def enforce_route_limit(request: Request) -> None:
+        if when is not None and not when(request):
+            return
+        key_func = getattr(request.app.state, "rate_limit_key", None)
+        if key_func is not None:
+            _enforce(request, name, key_func(request))
+
+    return enforce_route_limit
+
+
+def address_limit(request: Request) -> None:
+    """Per-address ceiling across every user and token key, applied to all routes.
+
+    Keys derived from unverifiable tokens are cheap to rotate; this bounds what one address
+    can get through regardless.
+    """
+    _enforce(request, "ip", f"ip:{get_remote_address(request)}")
+
+
+def has_search(request: Request) -> bool:
+    return bool(request.query_params.get("q", "").strip())
+
+
+__all__ = [
+    "address_limit",
+    "build_limiter",
+    "has_search",
+    "make_rate_limit_key",
+    "rate_limit_exceeded_handler",
+    "route_limit",
+    "route_limits",
+]
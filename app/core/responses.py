@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from .timing import timed
+
+
+class ModelResponse(ORJSONResponse):
+    """JSON rendered straight from an already-validated model.
+
+    Returning a Response makes FastAPI skip the ``response_model`` pass, which would otherwise
+    validate the model a second time and walk it through ``jsonable_encoder``. Routes keep
+    declaring ``response_model`` for the OpenAPI schema.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+        *,
+        exclude_unset: bool = False,
+    ):
+        self.exclude_unset = exclude_unset
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        with timed("serialization"):
+            if isinstance(content, BaseModel):
+                return content.model_dump_json(
+                    by_alias=True, exclude_unset=self.exclude_unset
+                ).encode()
+            return super().render(content)
+
+
+__all__ = ["ModelResponse", "ORJSONResponse"]
@@ -1,11 +1,12 @@
 from datetime import timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from fastapi import Depends, Request
 from fastapi.responses import Response
 
 from .config import Settings, get_settings
 from .errors import AppError
+from .tokens import TokenVerifier
 
 
 COOKIE_MAX_AGE = int(timedelta(days=7).total_seconds())
@@ -51,8 +52,29 @@ def clear_auth_cookies(response: Response, settings: Settings) -> None:
 
 
 class AuthContext:
-    def __init__(self, access_token: str):
+    def __init__(
+        self,
+        access_token: str,
+        user_id: Optional[str] = None,
+        email: Optional[str] = None,
+        role: Optional[str] = None,
+        claims: Optional[Dict[str, Any]] = None,
+    ):
         self.access_token = access_token
+        self.user_id = user_id
+        self.email = email
+        self.role = role
+        self.claims = claims
+
+    @classmethod
+    def from_claims(cls, access_token: str, claims: Dict[str, Any]) -> "AuthContext":
+        return cls(
+            access_token=access_token,
+            user_id=claims.get("sub"),
+            email=claims.get("email"),
+            role=claims.get("role"),
+            claims=claims,
+        )
 
 
 async def get_auth_context(
@@ -62,7 +84,11 @@ async def get_auth_context(
     token = request.cookies.get(settings.jwt_cookie_name)
     if not token:
         raise AppError("Authentication required", code="unauthorized", status_code=401)
-    return AuthContext(access_token=token)
+    verifier: Optional[TokenVerifier] = getattr(request.app.state, "token_verifier", None)
+    if verifier is None:
+        return AuthContext(access_token=token)
+    claims = await verifier.verify(token)
+    return AuthContext.from_claims(token, claims)
 
 
 __all__ = ["set_auth_cookies", "clear_auth_cookies", "AuthContext", "get_auth_context"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Phases reported in this order; anything else recorded is appended after them.
+PHASES = ("upstream", "validation", "serialization")
+
+
+class RequestTimings:
+    """Accumulated time per phase for one request.
+
+    Concurrent tasks spawned by the request (``asyncio.gather``, hedges) inherit the same
+    instance through the context, so their time adds up; ``upstream`` is therefore the sum of
+    all calls, which exceeds wall time when calls overlap.
+    """
+
+    __slots__ = ("started", "durations", "counts")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def header(self) -> str:
+        entries: List[str] = []
+        for phase in PHASES + tuple(p for p in self.durations if p not in PHASES):
+            if phase in self.durations:
+                entries.append(
+                    f'{phase};dur={self.durations[phase] * 1000:.1f};desc="{self.counts[phase]}x"'
+                )
+        entries.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record(phase: str, seconds: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the duration of the block to ``phase``; a no-op outside a timed request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+class ServerTimingMiddleware:
+    """Collects per-request phase timings and reports them in a ``Server-Timing`` header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _current.set(timings)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+
+__all__ = ["RequestTimings", "ServerTimingMiddleware", "record", "timed"]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import jwt
+from fastapi.responses import Response
+from starlette.datastructures import Headers
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import ReadCache, cache_scope
+from app.core.config import Settings
+from app.core.errors import AppError
+from app.core.security import set_auth_cookies
+from app.db.singleflight import SingleFlight
+from app.models.auth import AuthResponse
+from app.services.auth_service import AuthService
+
+logger = logging.getLogger(__name__)
+
+# These endpoints manage the auth cookies themselves.
+SKIP_PATHS = frozenset({"/auth/signin", "/auth/refresh", "/auth/signout"})
+MAX_CACHED_REFRESHES = 10_000
+
+
+def expires_within(token: str, seconds: float) -> bool:
+    """Whether the JWT's ``exp`` falls within ``seconds`` from now.
+
+    The signature is not checked: this only decides whether to spend the caller's own refresh
+    token, which GoTrue validates, and the new access token is verified as usual downstream.
+    """
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False, "verify_exp": False})
+    except jwt.InvalidTokenError:
+        return False
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        return False
+    return exp - time.time() <= seconds
+
+
+def _replace_cookies(scope: Scope, cookies: Dict[str, str]) -> None:
+    # In place: outer middleware reads what the router adds to this scope (e.g. "route").
+    cookie_header = "; ".join(f"{name}={value}" for name, value in cookies.items())
+    headers = [(name, value) for name, value in scope["headers"] if name != b"cookie"]
+    headers.append((b"cookie", cookie_header.encode("latin-1")))
+    scope["headers"] = headers
+
+
+class TokenRefreshMiddleware:
+    """Refreshes access tokens about to expire before the request reaches the routes.
+
+    The request's cookie header is rewritten so downstream auth sees the new token, and the
+    new cookies are set on the same response. Concurrent requests presenting the same refresh
+    token share one refresh, and its result is kept briefly so requests that still carry the
+    old cookies reuse it instead of replaying a refresh token GoTrue has already rotated.
+    """
+
+    def __init__(self, app: ASGIApp, settings: Settings):
+        self.app = app
+        self.settings = settings
+        self.leeway = settings.token_refresh_leeway
+        self._refreshes = SingleFlight()
+        self._recent = ReadCache(
+            ttl=settings.token_refresh_reuse_ttl, max_entries=MAX_CACHED_REFRESHES
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+        cookies = cookie_parser(Headers(scope=scope).get("cookie", ""))
+        access_token = cookies.get(self.settings.jwt_cookie_name)
+        refresh_token = cookies.get(self.settings.refresh_cookie_name)
+        if not access_token or not refresh_token or not expires_within(access_token, self.leeway):
+            await self.app(scope, receive, send)
+            return
+
+        auth = await self._refresh(scope, refresh_token)
+        if auth is None:
+            await self.app(scope, receive, send)
+            return
+
+        cookies[self.settings.jwt_cookie_name] = auth.access_token
+        if auth.refresh_token:
+            cookies[self.settings.refresh_cookie_name] = auth.refresh_token
+        set_cookie_headers = self._set_cookie_headers(auth)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message["headers"]) + set_cookie_headers}
+            await send(message)
+
+        _replace_cookies(scope, cookies)
+        await self.app(scope, receive, send_wrapper)
+
+    async def _refresh(self, scope: Scope, refresh_token: str) -> Optional[AuthResponse]:
+        key = cache_scope(refresh_token)
+        cached = self._recent.get(key, "auth")
+        if cached is not None:
+            return cached
+        supabase = getattr(scope["app"].state, "supabase_client", None)
+        if supabase is None:
+            return None
+        try:
+            auth = await self._refreshes.do(
+                key, lambda: AuthService(supabase).refresh(refresh_token)
+            )
+        except AppError as exc:
+            # Leave the request untouched; an expired token still fails with 401 downstream.
+            logger.info("Proactive token refresh failed: %s", exc.detail)
+            return None
+        self._recent.set(key, "auth", auth)
+        return auth
+
+    def _set_cookie_headers(self, auth: AuthResponse) -> List[Tuple[bytes, bytes]]:
+        carrier = Response()
+        set_auth_cookies(carrier, auth.access_token, auth.refresh_token, self.settings)
+        return [(name, value) for name, value in carrier.raw_headers if name == b"set-cookie"]
+
+
+__all__ = ["TokenRefreshMiddleware", "expires_within"]
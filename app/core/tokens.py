@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import jwt
+
+from .config import Settings
+from .errors import AppError
+
+
+JWKSFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+
+HMAC_ALGORITHMS = {"HS256"}
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+# Minimum delay between JWKS reloads triggered by an unknown ``kid``.
+JWKS_MIN_REFRESH_INTERVAL = 30.0
+
+
+def _invalid_token() -> AppError:
+    return AppError("Invalid access token", code="unauthorized", status_code=401)
+
+
+class TokenVerifier:
+    """Verifies Supabase access tokens locally against the JWT secret or the project JWKS."""
+
+    def __init__(self, settings: Settings, fetch_jwks: Optional[JWKSFetcher] = None):
+        self._secret = settings.jwt_secret
+        self._audience = settings.jwt_audience
+        self._leeway = settings.jwt_leeway
+        self._jwks_ttl = settings.jwks_cache_ttl
+        self._fetch_jwks = fetch_jwks
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._keys_loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError as exc:
+            raise _invalid_token() from exc
+
+        algorithm = header.get("alg")
+        key: Any
+        if algorithm in HMAC_ALGORITHMS and self._secret:
+            key = self._secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS and self._fetch_jwks is not None:
+            key = (await self._get_signing_key(header.get("kid"))).key
+        else:
+            raise _invalid_token()
+        return self._decode(token, key, algorithm)
+
+    def verify_cached(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verify with the secret or already-loaded JWKS only; None when that is not possible."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            return None
+        algorithm = header.get("alg")
+        key: Any
+        if algorithm in HMAC_ALGORITHMS and self._secret:
+            key = self._secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS and header.get("kid", "") in self._keys:
+            key = self._keys[header.get("kid", "")].key
+        else:
+            return None
+        try:
+            return self._decode(token, key, algorithm)
+        except AppError:
+            return None
+
+    def _decode(self, token: str, key: Any, algorithm: str) -> Dict[str, Any]:
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self._audience,
+                leeway=self._leeway,
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.InvalidTokenError as exc:
+            raise _invalid_token() from exc
+
+    def _keys_expired(self, now: float) -> bool:
+        return self._keys_loaded_at is None or now - self._keys_loaded_at >= self._jwks_ttl
+
+    async def _get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        now = time.monotonic()
+        key = self._keys.get(kid or "")
+        if key is not None and not self._keys_expired(now):
+            return key
+
+        async with self._lock:
+            now = time.monotonic()
+            key = self._keys.get(kid or "")
+            stale = self._keys_expired(now)
+            recently_loaded = (
+                self._keys_loaded_at is not None
+                and now - self._keys_loaded_at < JWKS_MIN_REFRESH_INTERVAL
+            )
+            # Unknown kids trigger a reload to pick up rotated keys, but not more
+            # often than JWKS_MIN_REFRESH_INTERVAL so bogus tokens cannot hammer GoTrue.
+            if stale or (key is None and not recently_loaded):
+                await self._load_keys(now)
+                key = self._keys.get(kid or "")
+
+        if key is None:
+            raise _invalid_token()
+        return key
+
+    async def _load_keys(self, now: float) -> None:
+        assert self._fetch_jwks is not None
+        payload = await self._fetch_jwks()
+        keys: Dict[str, jwt.PyJWK] = {}
+        for entry in payload.get("keys", []):
+            try:
+                jwk = jwt.PyJWK.from_dict(entry)
+            except jwt.PyJWTError:
+                continue
+            keys[entry.get("kid", "")] = jwk
+        self._keys = keys
+        self._keys_loaded_at = now
+
+
+__all__ = ["TokenVerifier"]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.core.config import Settings
+
+T = TypeVar("T")
+
+LATENCY_SAMPLES = 512
+# Recompute the percentile after this many new samples rather than on every request.
+RECOMPUTE_EVERY = 32
+# Hedge tokens that may accumulate during quiet periods, bounding bursts of extra requests.
+MAX_BUDGET_TOKENS = 10.0
+
+
+class LatencyTracker:
+    def __init__(self, percentile: float, max_samples: int = LATENCY_SAMPLES):
+        self._percentile = percentile
+        self._samples: Deque[float] = deque(maxlen=max_samples)
+        self._pending = 0
+        self._value: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._pending += 1
+
+    def value(self) -> Optional[float]:
+        if not self._samples:
+            return None
+        if self._value is None or self._pending >= RECOMPUTE_EVERY:
+            ordered = sorted(self._samples)
+            index = min(len(ordered) - 1, int(self._percentile * len(ordered)))
+            self._value = ordered[index]
+            self._pending = 0
+        return self._value
+
+
+class HedgePolicy:
+    """Decides when to send a backup request and keeps hedging within a fraction of traffic.
+
+    The delay is a latency percentile tracked per operation. Each primary request earns
+    ``budget`` of a token and each hedge spends a whole one, so at most that fraction of
+    requests is duplicated.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+    ):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def _tracker(self, operation: str) -> LatencyTracker:
+        tracker = self._trackers.get(operation)
+        if tracker is None:
+            tracker = self._trackers[operation] = LatencyTracker(self.percentile)
+        return tracker
+
+    def delay(self, operation: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        tracker = self._tracker(operation)
+        if len(tracker) < self.min_samples:
+            return None
+        return max(self.min_delay, tracker.value() or 0.0)
+
+    def observe(self, operation: str, seconds: float) -> None:
+        self._tracker(operation).observe(seconds)
+
+    def started(self) -> None:
+        self.requests += 1
+        self._tokens = min(MAX_BUDGET_TOKENS, self._tokens + self.budget)
+
+    def try_acquire(self) -> bool:
+        # Tolerance for the float error of summing many fractional budgets.
+        if self._tokens < 1.0 - 1e-9:
+            self.budget_denied += 1
+            return False
+        self._tokens -= 1.0
+        self.hedged += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_ratio": self.hedge_wins / self.hedged if self.hedged else 0.0,
+            "budget_denied": self.budget_denied,
+            "delays": {
+                operation: delay
+                for operation in self._trackers
+                if (delay := self.delay(operation)) is not None
+            },
+        }
+
+    async def run(self, operation: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()``; if it is slower than the hedge delay, race it against a second call."""
+        self.started()
+        delay = self.delay(operation)
+        primary = self._timed(operation, fn)
+        if delay is None:
+            return await primary
+        attempts = {primary}
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done or not self.try_acquire():
+                return await primary
+            backup = self._timed(operation, fn)
+            attempts.add(backup)
+            pending = set(attempts)
+            failed: Optional["asyncio.Task[T]"] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is backup:
+                            self.hedge_wins += 1
+                        return attempt.result()
+                    failed = failed or attempt
+            # Both attempts failed: report the first failure.
+            assert failed is not None
+            return failed.result()
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
+
+    def _timed(self, operation: str, fn: Callable[[], Awaitable[T]]) -> "asyncio.Task[T]":
+        started = time.perf_counter()
+
+        async def _call() -> T:
+            result = await fn()
+            self.observe(operation, time.perf_counter() - started)
+            return result
+
+        return asyncio.ensure_future(_call())
+
+
+def build_hedge_policy(settings: Settings) -> Optional[HedgePolicy]:
+    if not settings.hedge_reads:
+        return None
+    return HedgePolicy(
+        percentile=settings.hedge_percentile,
+        budget=settings.hedge_budget,
+        min_delay=settings.hedge_min_delay,
+        min_samples=settings.hedge_min_samples,
+    )
+
+
+__all__ = ["HedgePolicy", "LatencyTracker", "build_hedge_policy"]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from app.core.config import Settings
+
+
+TraceCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Acquiring a connection slower than this counts as having waited on the pool.
+POOL_WAIT_THRESHOLD = 0.001
+
+
+def build_limits(settings: Settings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+
+
+def build_timeout(settings: Settings) -> httpx.Timeout:
+    overrides = {
+        "connect": settings.http_connect_timeout,
+        "read": settings.http_read_timeout,
+        "write": settings.http_write_timeout,
+        "pool": settings.http_pool_timeout,
+    }
+    return httpx.Timeout(
+        settings.request_timeout,
+        **{name: value for name, value in overrides.items() if value is not None},
+    )
+
+
+class PoolMonitor:
+    """Tracks connection-pool usage through httpcore's ``trace`` request extension."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, limits: httpx.Limits):
+        self._transport = transport
+        self._limits = limits
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def request_started(self) -> TraceCallback:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        started = time.perf_counter()
+        acquired = False
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal acquired
+            if acquired:
+                return
+            if event == "connection.connect_tcp.started":
+                self.new_connections += 1
+            elif event.endswith("send_request_headers.started"):
+                self.reused_connections += 1
+            else:
+                return
+            acquired = True
+            self._record_wait(time.perf_counter() - started)
+
+        return trace
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+
+    def _record_wait(self, waited: float) -> None:
+        if waited < POOL_WAIT_THRESHOLD:
+            return
+        self.waits += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _connections(self) -> Optional[Dict[str, int]]:
+        pool = getattr(self._transport, "_pool", None)
+        if pool is None:
+            return None
+        connections = list(pool.connections)
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+    def stats(self) -> Dict[str, Any]:
+        acquired = self.new_connections + self.reused_connections
+        return {
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "connections": self._connections(),
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "new_connections": self.new_connections,
+            "reuse_ratio": self.reused_connections / acquired if acquired else 0.0,
+            "pool_waits": self.waits,
+            "pool_wait_seconds": self.wait_seconds,
+            "max_pool_wait_seconds": self.max_wait_seconds,
+        }
+
+
+__all__ = ["PoolMonitor", "build_limits", "build_timeout"]
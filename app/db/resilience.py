@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import email.utils
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+from app.core.config import Settings
+from app.core.errors import AppError
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Writes that set fixed values are only retried when they target a single row by primary key.
+ID_FILTER_METHODS = frozenset({"PUT", "PATCH", "DELETE"})
+
+
+def is_idempotent(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> bool:
+    method = method.upper()
+    if method in IDEMPOTENT_METHODS:
+        return True
+    if method not in ID_FILTER_METHODS:
+        return False
+    filters = dict(parse_qsl(urlsplit(url).query))
+    filters.update(params or {})
+    return str(filters.get("id", "")).startswith("eq.")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - time.time())
+
+
+def upstream_error(exc: httpx.TransportError) -> AppError:
+    if isinstance(exc, httpx.TimeoutException):
+        return AppError("Supabase request timed out", code="upstream_timeout", status_code=504)
+    return AppError("Supabase is unreachable", code="upstream_unavailable", status_code=502)
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter; an upstream ``Retry-After`` takes precedence."""
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        max_retry_after: float = 5.0,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+    def delay(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Seconds to sleep before retry number ``attempt + 1``, or None to give up."""
+        if attempt >= self.retries:
+            return None
+        if response is not None:
+            if response.status_code not in RETRY_STATUSES:
+                return None
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                # Waiting longer than this would blow the caller's own latency budget.
+                return retry_after if retry_after <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class CircuitBreaker:
+    """Opens when the failure ratio over a sliding time window crosses ``threshold``.
+
+    While open every call fails fast; after ``reset_timeout`` one probe is let through and its
+    outcome decides whether the circuit closes again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        min_calls: int = 20,
+        window: float = 30.0,
+        reset_timeout: float = 15.0,
+    ):
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        if self.state == self.CLOSED:
+            return
+        now = time.monotonic()
+        remaining = self._opened_at + self.reset_timeout - now
+        if self.state == self.OPEN and remaining <= 0:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise AppError(
+            "Supabase is temporarily unavailable",
+            code="upstream_unavailable",
+            status_code=503,
+            headers={"Retry-After": str(max(1, int(remaining + 1)))},
+        )
+
+    def record(self, success: bool) -> None:
+        now = time.monotonic()
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+            if success:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+                self._failures = 0
+            else:
+                self._open(now)
+            return
+        if self.state == self.OPEN:
+            # A call admitted before the circuit opened finished late; it changes nothing.
+            return
+        self._outcomes.append((now, success))
+        if not success:
+            self._failures += 1
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+        calls = len(self._outcomes)
+        if calls >= self.min_calls and self._failures / calls >= self.threshold:
+            self._open(now)
+
+    def abandon(self) -> None:
+        """The admitted call ended without an outcome (e.g. it was cancelled)."""
+        self._probing = False
+
+    def _open(self, now: float) -> None:
+        self.state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = 0
+        self.opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "opened": self.opened, "rejected": self.rejected}
+
+
+def build_retry_policy(settings: Settings) -> RetryPolicy:
+    return RetryPolicy(
+        retries=settings.upstream_retries,
+        backoff=settings.upstream_retry_backoff,
+        max_backoff=settings.upstream_retry_max_backoff,
+        max_retry_after=settings.upstream_retry_after_max,
+    )
+
+
+def build_circuit_breaker(settings: Settings) -> CircuitBreaker:
+    return CircuitBreaker(
+        threshold=settings.circuit_failure_threshold,
+        min_calls=settings.circuit_min_calls,
+        window=settings.circuit_window,
+        reset_timeout=settings.circuit_reset_timeout,
+    )
+
+
+__all__ = [
+    "CircuitBreaker",
+    "RetryPolicy",
+    "build_circuit_breaker",
+    "build_retry_policy",
+    "is_idempotent",
+    "parse_retry_after",
+    "upstream_error",
+]
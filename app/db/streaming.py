@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import re
+from typing import List
+
+_STRUCTURAL = re.compile(rb'[\[\]{},"\\]')
+_QUOTE, _BACKSLASH, _COMMA = 0x22, 0x5C, 0x2C
+_OPENERS, _CLOSERS = (0x5B, 0x7B), (0x5D, 0x7D)
+
+
+class JsonArraySplitter:
+    """Incrementally split a top-level JSON array into the raw bytes of its elements.
+
+    Only the element currently being received is buffered, so memory stays bounded by the
+    largest row rather than by the size of the array.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        buffer = self._buffer
+        position = len(buffer)
+        buffer += chunk
+        if self._escaped and chunk:
+            # The previous chunk ended on a backslash; the first byte here is escaped.
+            position += 1
+            self._escaped = False
+
+        elements: List[bytes] = []
+        start = 0
+        for match in _STRUCTURAL.finditer(buffer, position):
+            index = match.start()
+            if index < position:
+                continue
+            token = buffer[index]
+            if self._in_string:
+                if token == _BACKSLASH:
+                    position = index + 2
+                    self._escaped = position > len(buffer)
+                elif token == _QUOTE:
+                    self._in_string = False
+                continue
+            if token == _QUOTE:
+                self._in_string = True
+            elif token in _OPENERS:
+                self._depth += 1
+                if self._depth == 1:
+                    start = index + 1
+            elif token in _CLOSERS or (token == _COMMA and self._depth == 1):
+                if self._depth == 1:
+                    element = bytes(buffer[start:index]).strip()
+                    if element:
+                        elements.append(element)
+                    start = index + 1
+                if token != _COMMA:
+                    self._depth -= 1
+        del buffer[:start]
+        return elements
+
+
+__all__ = ["JsonArraySplitter"]
@@ -1,34 +1,162 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import asyncio
+import json as jsonlib
+import time
+from typing import Any, AsyncIterator, Awaitable, Dict, Optional
 
 import httpx
 from fastapi import Depends, Request
 
+from app.core.cache import ReadCache, cache_scope
 from app.core.config import Settings, get_settings
 from app.core.errors import AppError
+from app.core import timing
+from app.core.metrics import Metrics
+from app.db.hedging import build_hedge_policy
+from app.db.pool import PoolMonitor, build_limits, build_timeout
+from app.db.resilience import (
+    build_circuit_breaker,
+    build_retry_policy,
+    is_idempotent,
+    upstream_error,
+)
+from app.db.singleflight import SingleFlight, freeze
+
+
+_UNDECODED = object()
+# Upstream failures that a previously served copy of the same read may stand in for.
+STALE_FALLBACK_STATUSES = frozenset({502, 503, 504})
 
 
-@dataclass
 class SupabaseResponse:
-    data: Any
-    headers: httpx.Headers
+    """Upstream reply whose JSON body is decoded from ``content`` on first access of ``data``.
+
+    Callers that validate ``content`` directly (see ``app.services.validation``) never pay for
+    building the intermediate Python objects.
+    """
+
+    def __init__(
+        self, data: Any = _UNDECODED, headers: Optional[httpx.Headers] = None, content: bytes = b""
+    ):
+        self._data = data
+        self.headers = headers if headers is not None else httpx.Headers()
+        self.content = content
+
+    @property
+    def data(self) -> Any:
+        if self._data is _UNDECODED:
+            try:
+                self._data = jsonlib.loads(self.content) if self.content else {}
+            except ValueError:
+                self._data = {}
+        return self._data
 
 
 class SupabaseClient:
-    def __init__(self, settings: Settings):
+    def __init__(self, settings: Settings, metrics: Optional[Metrics] = None):
         self._settings = settings
+        self._metrics = metrics
         base_url = str(settings.supabase_url).rstrip("/")
+        limits = build_limits(settings)
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=settings.http2)
         self._client = httpx.AsyncClient(
             base_url=base_url,
-            timeout=settings.request_timeout,
+            timeout=build_timeout(settings),
             headers={"apikey": settings.supabase_anon_key},
+            transport=transport,
+        )
+        self._pool = PoolMonitor(transport, limits)
+        self._reads = SingleFlight() if settings.coalesce_reads else None
+        self._retry = build_retry_policy(settings)
+        self._breaker = build_circuit_breaker(settings)
+        self._hedge = build_hedge_policy(settings)
+        self._stale = (
+            ReadCache(
+                ttl=settings.stale_fallback_ttl, max_entries=settings.stale_fallback_max_entries
+            )
+            if settings.stale_fallback_ttl > 0
+            else None
         )
+        self.retries = 0
+        self.stale_served = 0
 
     async def close(self) -> None:
         await self._client.aclose()
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool": self._pool.stats(),
+            "coalescing": self._reads.stats() if self._reads is not None else None,
+            "resilience": {
+                "circuit": self._breaker.stats(),
+                "retries": self.retries,
+                "stale_served": self.stale_served,
+            },
+            "hedging": self._hedge.stats() if self._hedge is not None else None,
+        }
+
+    def _observe(
+        self, operation: str, table: str, method: str, status: str, started: float
+    ) -> None:
+        elapsed = time.perf_counter() - started
+        timing.record("upstream", elapsed)
+        if self._metrics is not None:
+            self._metrics.observe_upstream(operation, table, method, status, elapsed)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        operation: str,
+        table: str = "",
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send through the circuit breaker, retrying idempotent requests on transient failures.
+
+        Transport errors surface as ``AppError`` (502, or 504 on timeouts). With ``stream`` the
+        returned response is unread and the caller must close it and call
+        ``self._pool.request_finished()``. Every attempt is timed under ``operation``/``table``.
+        """
+        retryable = is_idempotent(method, url, kwargs.get("params"))
+        attempt = 0
+        while True:
+            self._breaker.before_call()
+            request = self._client.build_request(
+                method, url, extensions={"trace": self._pool.request_started()}, **kwargs
+            )
+            started = time.perf_counter()
+            try:
+                response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                self._pool.request_finished()
+                self._breaker.record(False)
+                outcome = "timeout" if isinstance(exc, httpx.TimeoutException) else "error"
+                self._observe(operation, table, method, outcome, started)
+                delay = self._retry.delay(attempt) if retryable else None
+                if delay is None:
+                    raise upstream_error(exc) from exc
+            except BaseException:
+                self._pool.request_finished()
+                self._breaker.abandon()
+                self._observe(operation, table, method, "cancelled", started)
+                raise
+            else:
+                self._breaker.record(response.status_code < 500)
+                self._observe(operation, table, method, str(response.status_code), started)
+                delay = self._retry.delay(attempt, response) if retryable else None
+                if delay is None:
+                    if not stream:
+                        self._pool.request_finished()
+                    return response
+                await response.aclose()
+                self._pool.request_finished()
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
     async def _handle_response(self, response: httpx.Response) -> SupabaseResponse:
         if response.status_code >= 400:
             try:
@@ -45,34 +173,40 @@ class SupabaseClient:
                 code="supabase_error",
                 status_code=response.status_code,
             )
-        if not response.content:
-            data: Any = {}
-        else:
-            try:
-                data = response.json()
-            except ValueError:
-                data = {}
-        return SupabaseResponse(data=data, headers=response.headers)
+        return SupabaseResponse(headers=response.headers, content=response.content)
 
     async def auth_sign_in(self, email: str, password: str) -> Any:
-        response = await self._client.post(
+        response = await self._send(
+            "POST",
             "/auth/v1/token?grant_type=password",
+            operation="auth_sign_in",
             json={"email": email, "password": password},
             headers={"Content-Type": "application/json", "apikey": self._settings.supabase_anon_key},
         )
         return (await self._handle_response(response)).data
 
     async def auth_refresh(self, refresh_token: str) -> Any:
-        response = await self._client.post(
+        response = await self._send(
+            "POST",
             "/auth/v1/token?grant_type=refresh_token",
+            operation="auth_refresh",
             json={"refresh_token": refresh_token},
             headers={"Content-Type": "application/json", "apikey": self._settings.supabase_anon_key},
         )
         return (await self._handle_response(response)).data
 
     async def auth_get_user(self, access_token: str) -> Any:
-        response = await self._client.get(
+        if self._reads is None:
+            return await self._auth_get_user(access_token)
+        return await self._reads.do(
+            ("auth_get_user", access_token), lambda: self._auth_get_user(access_token)
+        )
+
+    async def _auth_get_user(self, access_token: str) -> Any:
+        response = await self._send(
+            "GET",
             "/auth/v1/user",
+            operation="auth_get_user",
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "apikey": self._settings.supabase_anon_key,
@@ -80,9 +214,20 @@ class SupabaseClient:
         )
         return (await self._handle_response(response)).data
 
+    async def auth_get_jwks(self) -> Any:
+        response = await self._send(
+            "GET",
+            "/auth/v1/.well-known/jwks.json",
+            operation="auth_get_jwks",
+            headers={"apikey": self._settings.supabase_anon_key},
+        )
+        return (await self._handle_response(response)).data
+
     async def auth_sign_out(self, access_token: str) -> None:
-        response = await self._client.post(
+        response = await self._send(
+            "POST",
             "/auth/v1/logout",
+            operation="auth_sign_out",
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "apikey": self._settings.supabase_anon_key,
@@ -99,6 +244,44 @@ class SupabaseClient:
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Any] = None,
         headers: Optional[Dict[str, str]] = None,
+    ) -> SupabaseResponse:
+        if method.upper() not in ("GET", "HEAD"):
+            try:
+                return await self._rest_request(method, path, access_token, params, json, headers)
+            finally:
+                if self._stale is not None:
+                    self._stale.invalidate(cache_scope(access_token))
+        key = (method.upper(), path, freeze(params), freeze(headers))
+        try:
+            if self._reads is None:
+                response = await self._rest_request(
+                    method, path, access_token, params, json, headers
+                )
+            else:
+                response = await self._reads.do(
+                    key + (access_token,),
+                    lambda: self._rest_request(method, path, access_token, params, json, headers),
+                )
+        except AppError as exc:
+            if self._stale is None or exc.status_code not in STALE_FALLBACK_STATUSES:
+                raise
+            stale = self._stale.get(cache_scope(access_token), key)
+            if stale is None:
+                raise
+            self.stale_served += 1
+            return stale
+        if self._stale is not None:
+            self._stale.set(cache_scope(access_token), key, response)
+        return response
+
+    async def _rest_request(
+        self,
+        method: str,
+        path: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Any],
+        headers: Optional[Dict[str, str]],
     ) -> SupabaseResponse:
         final_headers = {
             "Authorization": f"Bearer {access_token}",
@@ -107,19 +290,73 @@ class SupabaseClient:
         }
         if headers:
             final_headers.update(headers)
-        response = await self._client.request(
-            method,
-            f"/rest/v1/{path}",
-            params=params,
-            json=json,
-            headers=final_headers,
-        )
+        table = path.split("?", 1)[0]
+
+        def send() -> Awaitable[httpx.Response]:
+            return self._send(
+                method,
+                f"/rest/v1/{path}",
+                operation="rest_request",
+                table=table,
+                params=params,
+                json=json,
+                headers=final_headers,
+            )
+
+        if self._hedge is not None and method.upper() in ("GET", "HEAD"):
+            response = await self._hedge.run(f"{method.upper()} {table}", send)
+        else:
+            response = await send()
         if method.upper() == "DELETE" and response.status_code in (200, 204):
             return SupabaseResponse(data=None, headers=response.headers)
         if response.status_code == 204:
             return SupabaseResponse(data={}, headers=response.headers)
         return await self._handle_response(response)
 
+    async def rest_stream(
+        self,
+        path: str,
+        access_token: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[bytes]:
+        """GET a PostgREST resource and return its body as an iterator of raw chunks.
+
+        The status is checked before returning, so upstream errors still surface as ``AppError``
+        rather than as a truncated stream.
+        """
+        final_headers = {
+            "Authorization": f"Bearer {access_token}",
+            "apikey": self._settings.supabase_anon_key,
+        }
+        if headers:
+            final_headers.update(headers)
+        response = await self._send(
+            "GET",
+            f"/rest/v1/{path}",
+            operation="rest_stream",
+            table=path.split("?", 1)[0],
+            stream=True,
+            params=params,
+            headers=final_headers,
+        )
+        if response.status_code >= 400:
+            try:
+                await response.aread()
+                await self._handle_response(response)
+            finally:
+                await response.aclose()
+                self._pool.request_finished()
+        return self._iter_body(response)
+
+    async def _iter_body(self, response: httpx.Response) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+        finally:
+            await response.aclose()
+            self._pool.request_finished()
+
 
 async def get_supabase_client(
     request: Request, settings: Settings = Depends(get_settings)
@@ -7,23 +7,36 @@ import re
 from ipaddress import ip_address
 from urllib.parse import urlparse
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter
+from fastapi.responses import ORJSONResponse
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
 
+from app.core.cache import ReadCache
+from app.core.compression import CompressionMiddleware
 from app.core.config import Settings, get_settings
+from app.core.etag import ETagMiddleware
 from app.core.errors import AppError, app_error_handler, unhandled_error_handler
+from app.core.metrics import Metrics, MetricsMiddleware
+from app.core.rate_limit import (
+    address_limit,
+    build_limiter,
+    make_rate_limit_key,
+    rate_limit_exceeded_handler,
+    route_limits,
+)
+from app.core.timing import ServerTimingMiddleware
+from app.core.token_refresh import TokenRefreshMiddleware
+from app.core.tokens import TokenVerifier
 from app.db.supabase_client import SupabaseClient
-from app.routers import auth, clients, tasks
+from app.routers import auth, batch, clients, dashboard, metrics, stats, tasks
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
-    supabase_client = SupabaseClient(settings)
+    supabase_client = SupabaseClient(settings, metrics=getattr(app.state, "metrics", None))
     app.state.supabase_client = supabase_client
     try:
         yield
@@ -33,14 +46,52 @@ async def lifespan(app: FastAPI):
 
 def create_app(settings: Settings | None = None) -> FastAPI:
     settings = settings or get_settings()
-    limiter = Limiter(key_func=get_remote_address, default_limits=[settings.rate_limit])
-    app = FastAPI(title="Flutter BFF", version="0.1.0", lifespan=lifespan)
+    limiter = build_limiter(settings)
+    app = FastAPI(
+        title="Flutter BFF",
+        version="0.1.0",
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        dependencies=[Depends(address_limit)],
+    )
 
     app.state.limiter = limiter
+    app.state.route_limits = route_limits(settings)
+    app.state.rate_limit_key = make_rate_limit_key(settings)
+    if settings.jwt_local_verification:
+
+        async def fetch_jwks():
+            return await app.state.supabase_client.auth_get_jwks()
+
+        app.state.token_verifier = TokenVerifier(settings, fetch_jwks=fetch_jwks)
+    if settings.read_cache_ttl > 0:
+        app.state.read_cache = ReadCache(
+            ttl=settings.read_cache_ttl, max_entries=settings.read_cache_max_entries
+        )
     app.add_exception_handler(AppError, app_error_handler)
-    app.add_exception_handler(RateLimitExceeded, app_error_handler)
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
     app.add_exception_handler(Exception, unhandled_error_handler)
+    if settings.etag_enabled:
+        # Inside SlowAPI and token refresh: 304s answered from remembered validators still
+        # count against the default limits and are keyed on the refreshed cookies.
+        app.add_middleware(ETagMiddleware)
     app.add_middleware(SlowAPIMiddleware)
+    if settings.token_refresh_leeway > 0:
+        # Outside SlowAPI so rate-limit keys are derived from the refreshed token.
+        app.add_middleware(TokenRefreshMiddleware, settings=settings)
+    if settings.compression_enabled:
+        # Outside ETagMiddleware so tags are computed over the uncompressed representation.
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_min_size,
+            content_types=settings.compression_content_types,
+            encodings=settings.compression_encodings,
+            levels={
+                "gzip": settings.gzip_level,
+                "br": settings.brotli_quality,
+                "zstd": settings.zstd_level,
+            },
+        )
 
     allow_origins: list[str] = []
     regex_patterns: list[str] = []
@@ -86,6 +137,11 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.metrics_enabled:
+        app.state.metrics = Metrics()
+        app.add_middleware(MetricsMiddleware, metrics=app.state.metrics)
+    if settings.server_timing_enabled:
+        app.add_middleware(ServerTimingMiddleware)
 
     @app.middleware("http")
     async def add_request_id(request, call_next):
@@ -98,6 +154,11 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     app.include_router(auth.router)
     app.include_router(clients.router)
     app.include_router(tasks.router)
+    app.include_router(dashboard.router)
+    app.include_router(batch.router)
+    app.include_router(stats.router)
+    if settings.metrics_enabled:
+        app.include_router(metrics.router)
 
     return app
 
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import posixpath
+from typing import Any, Dict, List, Literal, Optional
+from urllib.parse import unquote
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+BATCH_MAX_REQUESTS = 20
+# Nested batches would multiply the fan-out, and the sign-in, refresh and sign-out
+# endpoints set cookies, which sub-responses cannot carry.
+BATCH_FORBIDDEN_PREFIXES = ("/batch", "/auth/signin", "/auth/refresh", "/auth/signout")
+
+
+class BatchSubRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    id: Optional[str] = None
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+    @field_validator("path")
+    @classmethod
+    def validate_path(cls, value: str) -> str:
+        if not value.startswith("/") or value.startswith("//"):
+            raise ValueError("path must be relative to the API root, e.g. /tasks?page=1")
+        # Compare the path the router will see: percent-decoded, with dot segments resolved.
+        route = posixpath.normpath(unquote(value.split("?")[0]))
+        for prefix in BATCH_FORBIDDEN_PREFIXES:
+            if route == prefix or route.startswith(f"{prefix}/"):
+                raise ValueError(f"{prefix} cannot be called from a batch")
+        return value
+
+
+class BatchRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    requests: List[BatchSubRequest] = Field(min_length=1, max_length=BATCH_MAX_REQUESTS)
+
+
+class BatchSubResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str]
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    responses: List[BatchSubResponse]
+
+
+__all__ = [
+    "BATCH_FORBIDDEN_PREFIXES",
+    "BATCH_MAX_REQUESTS",
+    "BatchRequest",
+    "BatchResponse",
+    "BatchSubRequest",
+    "BatchSubResponse",
+]
@@ -77,6 +77,10 @@ class ClientUpdate(BaseModel):
     tax_profile: Optional[TaxProfile] = Field(alias="taxProfile", default=None)
 
 
+class ClientPartial(ClientUpdate):
+    id: str
+
+
 class ClientList(BaseModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
@@ -84,6 +88,19 @@ class ClientList(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
+
+
+class ClientPartialList(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    items: List[ClientPartial]
+    total: int
+    page: int
+    page_size: int
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
 
 
 __all__ = [
@@ -95,4 +112,6 @@ __all__ = [
     "ClientCreate",
     "ClientUpdate",
     "ClientList",
+    "ClientPartial",
+    "ClientPartialList",
 ]
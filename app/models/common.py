@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class CountStrategy(str, Enum):
+    exact = "exact"
+    planned = "planned"
+    estimated = "estimated"
+    none = "none"
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+__all__ = ["CountStrategy", "ExportFormat"]
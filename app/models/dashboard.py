@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.clients import PaymentState
+from app.models.tasks import TaskStatus
+
+
+class DashboardSummary(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    tasks_total: int = Field(alias="tasksTotal")
+    tasks_by_status: Dict[TaskStatus, int] = Field(alias="tasksByStatus")
+    overdue_tasks: int = Field(alias="overdueTasks")
+    clients_total: int = Field(alias="clientsTotal")
+    clients_by_payment_state: Dict[PaymentState, int] = Field(alias="clientsByPaymentState")
+    pending_payment_amount: float = Field(alias="pendingPaymentAmount")
+
+
+__all__ = ["DashboardSummary"]
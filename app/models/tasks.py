@@ -7,6 +7,9 @@ from typing import List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 
+TASK_BATCH_MAX_ITEMS = 100
+
+
 class TaskStatus(str, Enum):
     sin_iniciar = "sin_iniciar"
     en_proceso = "en_proceso"
@@ -50,6 +53,10 @@ class TaskUpdate(BaseModel):
     updated_at: Optional[datetime] = Field(alias="updatedAt", default=None)
 
 
+class TaskPartial(TaskUpdate):
+    id: str
+
+
 class TaskList(BaseModel):
     model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
 
@@ -57,6 +64,63 @@ class TaskList(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
+
+
+class TaskPartialList(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    items: List[TaskPartial]
+    total: int
+    page: int
+    page_size: int
+    next_cursor: Optional[str] = None
+    total_exact: bool = True
+
+
+class TaskBatchUpdate(TaskUpdate):
+    id: str
+
+
+class TaskBatchRequest(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    creates: List[TaskCreate] = Field(default=[], max_length=TASK_BATCH_MAX_ITEMS)
+    updates: List[TaskBatchUpdate] = Field(default=[], max_length=TASK_BATCH_MAX_ITEMS)
+    deletes: List[str] = Field(default=[], max_length=TASK_BATCH_MAX_ITEMS)
+
+
+class TaskBatchOperation(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+
+class TaskBatchItemResult(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    op: TaskBatchOperation
+    index: int
+    id: Optional[str] = None
+    status: int
+    task: Optional[Task] = None
+    code: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    results: List[TaskBatchItemResult]
+
+
+class TaskMove(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, serialize_by_alias=True)
+
+    before_id: Optional[str] = Field(default=None, alias="beforeId")
+    after_id: Optional[str] = Field(default=None, alias="afterId")
+    status: Optional[TaskStatus] = None
 
 
 class TaskFilters(BaseModel):
@@ -69,10 +133,19 @@ class TaskFilters(BaseModel):
 
 
 __all__ = [
+    "TASK_BATCH_MAX_ITEMS",
     "Task",
     "TaskCreate",
     "TaskUpdate",
     "TaskList",
+    "TaskPartial",
+    "TaskPartialList",
     "TaskStatus",
     "TaskFilters",
+    "TaskBatchUpdate",
+    "TaskBatchRequest",
+    "TaskBatchOperation",
+    "TaskBatchItemResult",
+    "TaskBatchResponse",
+    "TaskMove",
 ]
@@ -1,3 +1,3 @@
-from . import auth, clients, tasks
+from . import auth, batch, clients, dashboard, metrics, stats, tasks
 
-__all__ = ["auth", "clients", "tasks"]
+__all__ = ["auth", "batch", "clients", "dashboard", "metrics", "stats", "tasks"]
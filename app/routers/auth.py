@@ -49,7 +49,7 @@ async def me(
     auth: AuthContext = Depends(get_auth_context),
     service: AuthService = Depends(get_auth_service),
 ) -> MeResponse:
-    user = await service.me(auth.access_token)
+    user = await service.me(auth.access_token, claims=auth.claims)
     return MeResponse(user=user)
 
 
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Request
+
+from app.core.config import Settings, get_settings
+from app.core.errors import AppError
+from app.core.rate_limit import route_limit
+from app.core.responses import ModelResponse
+from app.models.batch import BatchRequest, BatchResponse
+from app.services.batch_service import SUB_REQUEST_HEADER, BatchService
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+def get_batch_service(request: Request, settings: Settings = Depends(get_settings)) -> BatchService:
+    if request.headers.get(SUB_REQUEST_HEADER):
+        raise AppError("Batch requests cannot be nested", code="invalid_batch", status_code=400)
+    client = (request.client.host, request.client.port) if request.client else None
+    return BatchService(
+        request.app,
+        cookie=request.headers.get("cookie"),
+        client=client,
+        max_concurrency=settings.batch_max_concurrency,
+    )
+
+
+@router.post("", response_model=BatchResponse, dependencies=[Depends(route_limit("batch"))])
+async def batch(
+    payload: BatchRequest, service: BatchService = Depends(get_batch_service)
+) -> ModelResponse:
+    return ModelResponse(await service.run(payload))
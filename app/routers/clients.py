@@ -3,32 +3,77 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.core.cache import ReadCache, get_read_cache
+from app.core.config import Settings, get_settings
+from app.core.rate_limit import has_search, route_limit
+from app.core.responses import ModelResponse
 from app.core.security import AuthContext, get_auth_context
 from app.db.supabase_client import SupabaseClient, get_supabase_client
 from app.models.clients import Client, ClientCreate, ClientList, ClientUpdate
+from app.models.common import CountStrategy, ExportFormat
+from app.services.export import EXPORT_MEDIA_TYPES
+from app.services.fields import select_columns
 from app.services.clients_service import ClientsService
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 
-def get_clients_service(supabase: SupabaseClient = Depends(get_supabase_client)) -> ClientsService:
-    return ClientsService(supabase)
+def get_clients_service(
+    supabase: SupabaseClient = Depends(get_supabase_client),
+    cache: Optional[ReadCache] = Depends(get_read_cache),
+    settings: Settings = Depends(get_settings),
+    auth: AuthContext = Depends(get_auth_context),
+) -> ClientsService:
+    return ClientsService(
+        supabase, cache=cache, validation=settings.upstream_validation, user_id=auth.user_id
+    )
 
 
-@router.get("", response_model=ClientList)
+@router.get(
+    "",
+    response_model=ClientList,
+    dependencies=[Depends(route_limit("list")), Depends(route_limit("search", when=has_search))],
+)
 async def list_clients(
     auth: AuthContext = Depends(get_auth_context),
     service: ClientsService = Depends(get_clients_service),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     q: Optional[str] = Query(default=None),
-) -> ClientList:
-    return await service.list_clients(
+    cursor: Optional[str] = Query(default=None),
+    count: Optional[CountStrategy] = Query(default=None),
+    fields: Optional[str] = Query(default=None),
+    settings: Settings = Depends(get_settings),
+) -> ModelResponse:
+    columns = select_columns(fields, Client)
+    result = await service.list_clients(
         auth.access_token,
         page=page,
         page_size=page_size,
         q=q,
+        cursor=cursor,
+        count=count or CountStrategy(settings.clients_count_strategy),
+        fields=columns,
+    )
+    # Sparse rows carry only the selected fields; leave the unset ones out of the payload.
+    return ModelResponse(result, exclude_unset=bool(columns))
+
+
+@router.get(
+    "/export", response_class=StreamingResponse, dependencies=[Depends(route_limit("export"))]
+)
+async def export_clients(
+    auth: AuthContext = Depends(get_auth_context),
+    service: ClientsService = Depends(get_clients_service),
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+) -> StreamingResponse:
+    body = await service.export_clients(auth.access_token, fmt)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="clients.{fmt.value}"'},
     )
 
 
@@ -37,8 +82,8 @@ async def get_client(
     client_id: str,
     auth: AuthContext = Depends(get_auth_context),
     service: ClientsService = Depends(get_clients_service),
-) -> Client:
-    return await service.get_client(auth.access_token, client_id)
+) -> ModelResponse:
+    return ModelResponse(await service.get_client(auth.access_token, client_id))
 
 
 @router.post("", response_model=Client, status_code=201)
@@ -46,8 +91,9 @@ async def create_client(
     payload: ClientCreate,
     auth: AuthContext = Depends(get_auth_context),
     service: ClientsService = Depends(get_clients_service),
-) -> Client:
-    return await service.create_client(auth.access_token, payload)
+) -> ModelResponse:
+    client = await service.create_client(auth.access_token, payload)
+    return ModelResponse(client, status_code=201)
 
 
 @router.put("/{client_id}", response_model=Client)
@@ -56,8 +102,8 @@ async def update_client(
     payload: ClientUpdate,
     auth: AuthContext = Depends(get_auth_context),
     service: ClientsService = Depends(get_clients_service),
-) -> Client:
-    return await service.update_client(auth.access_token, client_id, payload)
+) -> ModelResponse:
+    return ModelResponse(await service.update_client(auth.access_token, client_id, payload))
 
 
 @router.delete(
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+
+from app.core.cache import ReadCache, get_read_cache
+from app.core.config import Settings, get_settings
+from app.core.responses import ModelResponse
+from app.core.security import AuthContext, get_auth_context
+from app.db.supabase_client import SupabaseClient, get_supabase_client
+from app.models.dashboard import DashboardSummary
+from app.services.dashboard_service import DashboardService
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+def get_dashboard_service(
+    supabase: SupabaseClient = Depends(get_supabase_client),
+    cache: Optional[ReadCache] = Depends(get_read_cache),
+    settings: Settings = Depends(get_settings),
+    auth: AuthContext = Depends(get_auth_context),
+) -> DashboardService:
+    return DashboardService(
+        supabase, cache=cache, aggregates=settings.postgrest_aggregates, user_id=auth.user_id
+    )
+
+
+@router.get("", response_model=DashboardSummary)
+async def dashboard(
+    auth: AuthContext = Depends(get_auth_context),
+    service: DashboardService = Depends(get_dashboard_service),
+) -> ModelResponse:
+    return ModelResponse(await service.summary(auth.access_token))
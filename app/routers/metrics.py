@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.cache import ReadCache, get_read_cache
+from app.core.metrics import CONTENT_TYPE
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    request: Request, cache: Optional[ReadCache] = Depends(get_read_cache)
+) -> PlainTextResponse:
+    supabase = getattr(request.app.state, "supabase_client", None)
+    body = request.app.state.metrics.render(
+        {
+            "read_cache": cache.stats() if cache is not None else None,
+            "supabase": supabase.stats() if supabase is not None else None,
+        }
+    )
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Request
+
+from app.core.cache import ReadCache, get_read_cache
+from app.core.security import get_auth_context
+
+# Pool, breaker and cache internals are not for anonymous callers.
+router = APIRouter(prefix="/stats", tags=["stats"], dependencies=[Depends(get_auth_context)])
+
+
+@router.get("")
+async def stats(
+    request: Request, cache: Optional[ReadCache] = Depends(get_read_cache)
+) -> Dict[str, Any]:
+    supabase = getattr(request.app.state, "supabase_client", None)
+    return {
+        "read_cache": cache.stats() if cache is not None else None,
+        "supabase": supabase.stats() if supabase is not None else None,
+    }
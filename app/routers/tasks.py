@@ -3,21 +3,50 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 
+from app.core.cache import ReadCache, get_read_cache
+from app.core.config import Settings, get_settings
+from app.core.rate_limit import has_search, route_limit
+from app.core.responses import ModelResponse
 from app.core.security import AuthContext, get_auth_context
 from app.db.supabase_client import SupabaseClient, get_supabase_client
-from app.models.tasks import Task, TaskCreate, TaskFilters, TaskList, TaskStatus, TaskUpdate
+from app.models.common import CountStrategy, ExportFormat
+from app.models.tasks import (
+    Task,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskCreate,
+    TaskFilters,
+    TaskList,
+    TaskMove,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.services.export import EXPORT_MEDIA_TYPES
+from app.services.fields import select_columns
 from app.services.tasks_service import TasksService
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-def get_tasks_service(supabase: SupabaseClient = Depends(get_supabase_client)) -> TasksService:
-    return TasksService(supabase)
+def get_tasks_service(
+    supabase: SupabaseClient = Depends(get_supabase_client),
+    cache: Optional[ReadCache] = Depends(get_read_cache),
+    settings: Settings = Depends(get_settings),
+    auth: AuthContext = Depends(get_auth_context),
+) -> TasksService:
+    return TasksService(
+        supabase, cache=cache, validation=settings.upstream_validation, user_id=auth.user_id
+    )
 
 
-@router.get("", response_model=TaskList)
+@router.get(
+    "",
+    response_model=TaskList,
+    dependencies=[Depends(route_limit("list")), Depends(route_limit("search", when=has_search))],
+)
 async def list_tasks(
     auth: AuthContext = Depends(get_auth_context),
     service: TasksService = Depends(get_tasks_service),
@@ -27,13 +56,39 @@ async def list_tasks(
     due_from: Optional[datetime] = Query(default=None, alias="dueFrom"),
     due_to: Optional[datetime] = Query(default=None, alias="dueTo"),
     q: Optional[str] = Query(default=None),
-) -> TaskList:
+    cursor: Optional[str] = Query(default=None),
+    count: Optional[CountStrategy] = Query(default=None),
+    fields: Optional[str] = Query(default=None),
+    settings: Settings = Depends(get_settings),
+) -> ModelResponse:
     filters = TaskFilters(status=status, due_from=due_from, due_to=due_to, q=q)
-    return await service.list_tasks(
+    columns = select_columns(fields, Task)
+    result = await service.list_tasks(
         auth.access_token,
         page=page,
         page_size=page_size,
         filters=filters,
+        cursor=cursor,
+        count=count or CountStrategy(settings.tasks_count_strategy),
+        fields=columns,
+    )
+    # Sparse rows carry only the selected fields; leave the unset ones out of the payload.
+    return ModelResponse(result, exclude_unset=bool(columns))
+
+
+@router.get(
+    "/export", response_class=StreamingResponse, dependencies=[Depends(route_limit("export"))]
+)
+async def export_tasks(
+    auth: AuthContext = Depends(get_auth_context),
+    service: TasksService = Depends(get_tasks_service),
+    fmt: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+) -> StreamingResponse:
+    body = await service.export_tasks(auth.access_token, fmt)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{fmt.value}"'},
     )
 
 
@@ -42,8 +97,8 @@ async def get_task(
     task_id: str,
     auth: AuthContext = Depends(get_auth_context),
     service: TasksService = Depends(get_tasks_service),
-) -> Task:
-    return await service.get_task(auth.access_token, task_id)
+) -> ModelResponse:
+    return ModelResponse(await service.get_task(auth.access_token, task_id))
 
 
 @router.post("", response_model=Task, status_code=201)
@@ -51,8 +106,18 @@ async def create_task(
     payload: TaskCreate,
     auth: AuthContext = Depends(get_auth_context),
     service: TasksService = Depends(get_tasks_service),
-) -> Task:
-    return await service.create_task(auth.access_token, payload)
+) -> ModelResponse:
+    task = await service.create_task(auth.access_token, payload)
+    return ModelResponse(task, status_code=201)
+
+
+@router.post("/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    payload: TaskBatchRequest,
+    auth: AuthContext = Depends(get_auth_context),
+    service: TasksService = Depends(get_tasks_service),
+) -> ModelResponse:
+    return ModelResponse(await service.batch_tasks(auth.access_token, payload))
 
 
 @router.put("/{task_id}", response_model=Task)
@@ -61,8 +126,8 @@ async def update_task(
     payload: TaskUpdate,
     auth: AuthContext = Depends(get_auth_context),
     service: TasksService = Depends(get_tasks_service),
-) -> Task:
-    return await service.update_task(auth.access_token, task_id, payload)
+) -> ModelResponse:
+    return ModelResponse(await service.update_task(auth.access_token, task_id, payload))
 
 
 @router.delete("/{task_id}", status_code=204, response_class=Response)
@@ -80,5 +145,18 @@ async def complete_task(
     task_id: str,
     auth: AuthContext = Depends(get_auth_context),
     service: TasksService = Depends(get_tasks_service),
-) -> Task:
-    return await service.complete_task(auth.access_token, task_id)
+) -> ModelResponse:
+    return ModelResponse(await service.complete_task(auth.access_token, task_id))
+
+
+@router.post("/{task_id}/move", response_model=Task)
+async def move_task(
+    task_id: str,
+    payload: TaskMove,
+    background_tasks: BackgroundTasks,
+    auth: AuthContext = Depends(get_auth_context),
+    service: TasksService = Depends(get_tasks_service),
+) -> ModelResponse:
+    return ModelResponse(
+        await service.move_task(auth.access_token, task_id, payload, background_tasks)
+    )
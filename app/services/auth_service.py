@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from app.core.errors import AppError
 from app.db.supabase_client import SupabaseClient
@@ -21,9 +21,11 @@ class AuthService:
         payload = await self._supabase.auth_refresh(refresh_token)
         return AuthResponse.model_validate(payload)
 
-    async def me(self, access_token: str) -> AuthUser:
+    async def me(self, access_token: str, claims: Optional[Dict[str, Any]] = None) -> AuthUser:
         if not access_token:
             raise AppError("Missing access token", code="unauthorized", status_code=401)
+        if claims and claims.get("email"):
+            return AuthUser(id=claims["sub"], email=claims["email"], role=claims.get("role"))
         payload = await self._supabase.auth_get_user(access_token)
         user = payload.get("user") or payload
         return AuthUser.model_validate(user)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional, Tuple
+
+import httpx
+from starlette.types import ASGIApp
+
+from app.models.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+
+# Headers owned by the batch itself: credentials come from the outer request, and sub-responses
+# are embedded in one JSON document, so they must not be compressed individually.
+_RESERVED_HEADERS = {"cookie", "host", "content-length", "accept-encoding", "transfer-encoding"}
+# Marks in-process sub-requests so the batch endpoint can refuse to be reached from one.
+SUB_REQUEST_HEADER = "x-batch-sub-request"
+
+
+class BatchService:
+    """Dispatches sub-requests through the app in-process, sharing the caller's cookies."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        cookie: Optional[str],
+        client: Optional[Tuple[str, int]],
+        max_concurrency: int,
+    ):
+        self._app = app
+        self._cookie = cookie
+        # Sub-requests keep the caller's address so per-client rate limits still apply to them.
+        self._client = client or ("127.0.0.1", 0)
+        self._max_concurrency = max(1, max_concurrency)
+
+    async def run(self, batch: BatchRequest) -> BatchResponse:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        transport = httpx.ASGITransport(
+            app=self._app, raise_app_exceptions=False, client=self._client
+        )
+        async with httpx.AsyncClient(transport=transport, base_url="http://batch") as client:
+
+            async def dispatch(sub: BatchSubRequest) -> BatchSubResponse:
+                async with semaphore:
+                    return await self._dispatch(client, sub)
+
+            responses = await asyncio.gather(*[dispatch(sub) for sub in batch.requests])
+        return BatchResponse(responses=list(responses))
+
+    async def _dispatch(self, client: httpx.AsyncClient, sub: BatchSubRequest) -> BatchSubResponse:
+        headers = {
+            name: value
+            for name, value in sub.headers.items()
+            if name.lower() not in _RESERVED_HEADERS
+        }
+        headers["accept-encoding"] = "identity"
+        headers[SUB_REQUEST_HEADER] = "1"
+        if self._cookie:
+            headers["cookie"] = self._cookie
+        response = await client.request(
+            sub.method,
+            sub.path,
+            headers=headers,
+            json=sub.body,
+        )
+        body: Any = None
+        if response.content:
+            if response.headers.get("content-type", "").startswith("application/json"):
+                body = response.json()
+            else:
+                body = response.text
+        return BatchSubResponse(
+            id=sub.id,
+            status=response.status_code,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name not in ("content-length", "set-cookie")
+            },
+            body=body,
+        )
+
+
+__all__ = ["SUB_REQUEST_HEADER", "BatchService"]
@@ -1,26 +1,64 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from app.core.cache import ReadCache, cache_scope
 from app.core.errors import AppError
 from app.db.supabase_client import SupabaseClient
-from app.models.clients import Client, ClientCreate, ClientList, ClientUpdate
+from app.models.clients import (
+    Client,
+    ClientCreate,
+    ClientList,
+    ClientPartial,
+    ClientPartialList,
+    ClientUpdate,
+)
+from app.models.common import CountStrategy, ExportFormat
+from app.services.export import TableExport
+from app.services.fields import model_columns
+from app.services.pagination import (
+    CachedTotals,
+    add_and_condition,
+    count_headers,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    parse_total,
+)
+from app.services.validation import ValidationMode, validate_row, validate_rows
+
+CLIENT_COLUMNS = model_columns(Client)
+SEARCH_FUNCTION = "rpc/search_clients"
 
 
 class ClientsService:
-    def __init__(self, supabase: SupabaseClient):
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        cache: Optional[ReadCache] = None,
+        validation: ValidationMode = "json",
+        user_id: Optional[str] = None,
+    ):
         self._supabase = supabase
+        self._cache = cache
+        self._validation = validation
+        self._user_id = user_id
+        self._totals = (
+            CachedTotals(supabase, cache, "clients", user_id) if cache is not None else None
+        )
+
+    def _scope(self, access_token: str) -> str:
+        return cache_scope(access_token, self._user_id)
+
+    def _invalidate(self, access_token: str) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(self._scope(access_token))
 
     @staticmethod
-    def _parse_total(headers) -> int:
-        content_range = headers.get("content-range")
-        if not content_range:
-            return 0
-        try:
-            _, total = content_range.split("/")
-            return int(total)
-        except ValueError:
-            return 0
+    def _parse_total(
+        headers, strategy: CountStrategy = CountStrategy.exact
+    ) -> Tuple[Optional[int], bool]:
+        return parse_total(headers, strategy)
 
     async def list_clients(
         self,
@@ -30,69 +68,156 @@ class ClientsService:
         page_size: int = 20,
         q: Optional[str] = None,
         filters: Optional[Dict[str, str]] = None,
-    ) -> ClientList:
-        start = (page - 1) * page_size
-        end = start + page_size - 1
-        params: Dict[str, str] = {"select": "*", "order": "name_or_business"}
+        cursor: Optional[str] = None,
+        count: CountStrategy = CountStrategy.exact,
+        fields: Optional[List[str]] = None,
+    ) -> Union[ClientList, ClientPartialList]:
+        cache_key = (
+            "clients",
+            page,
+            page_size,
+            cursor,
+            count.value,
+            tuple(fields or ()),
+            (q or "").strip(),
+            tuple(sorted((filters or {}).items())),
+        )
+        if self._cache is not None:
+            cached = self._cache.get(self._scope(access_token), cache_key)
+            if cached is not None:
+                return cached
+
+        q = (q or "").strip()
+        filter_params: Dict[str, str] = {}
         if q:
-            params["or"] = f"(name_or_business.ilike.*{q}*,notes.ilike.*{q}*)"
+            # Served by the GIN index on the generated search_tsv column (migrations/002).
+            filter_params["search_tsv"] = f"wfts(spanish).{q}"
         if filters:
-            params.update(filters)
-        headers = {"Range": f"{start}-{end}", "Prefer": "count=exact"}
+            filter_params.update(filters)
+        columns = list(fields) if fields else None
+        if columns and cursor is not None and "name_or_business" not in columns:
+            columns.append("name_or_business")
+        select = ",".join(columns) if columns else CLIENT_COLUMNS
+        params: Dict[str, str] = {"select": select, "order": "name_or_business"}
+        params.update(filter_params)
+        path = "clients"
+        headers: Dict[str, str] = {}
+        page_count = count
+        if cursor is None:
+            start = (page - 1) * page_size
+            headers["Range"] = f"{start}-{start + page_size - 1}"
+            if q:
+                # Offset pages of a search are ranked by relevance inside search_clients().
+                path = SEARCH_FUNCTION
+                del params["order"], params["search_tsv"]
+                params["q"] = q
+        else:
+            # Keyset mode: seek past the last (name_or_business, id) seen instead of skipping rows.
+            params["order"] = "name_or_business.asc,id.asc"
+            params["limit"] = str(page_size + 1)
+            if cursor:
+                last_name, last_id = decode_cursor(cursor, "clients")
+                add_and_condition(params, keyset_condition("name_or_business", last_name, last_id))
+                # A count here would only see the rows past the cursor; the list total
+                # comes from CachedTotals over the unseeked filters instead.
+                page_count = CountStrategy.none
+        headers.update(count_headers(page_count))
         response = await self._supabase.rest_request(
-            "GET", "clients", access_token, params=params, headers=headers
+            "GET", path, access_token, params=params, headers=headers
         )
-        data = response.data
-        if not isinstance(data, list):
-            raise AppError("Invalid response from Supabase", code="supabase_error", status_code=502)
-        total = self._parse_total(response.headers)
-        return ClientList(
-            items=[Client.model_validate(i) for i in data],
+        list_model, item_model = (
+            (ClientPartialList, ClientPartial) if fields else (ClientList, Client)
+        )
+        items = validate_rows(response, item_model, self._validation)
+        next_cursor = None
+        if cursor is not None and len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor("clients", [items[-1].name_or_business, items[-1].id])
+        total, total_exact = self._parse_total(response.headers, page_count)
+        if total_exact and self._totals is not None:
+            self._totals.set(access_token, filter_params, total)
+        elif self._totals is not None:
+            cached_total = self._totals.get(access_token, filter_params)
+            if cached_total is None:
+                self._totals.refresh_later(access_token, filter_params)
+            else:
+                total, total_exact = cached_total, True
+        if total is None:
+            offset = (page - 1) * page_size if cursor is None else 0
+            total = offset + len(items)
+        result = list_model(
+            items=items,
             total=total,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
+            total_exact=total_exact,
+        )
+        if self._cache is not None and total_exact:
+            self._cache.set(self._scope(access_token), cache_key, result)
+        return result
+
+    async def export_clients(self, access_token: str, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        export = TableExport(
+            self._supabase,
+            access_token,
+            table="clients",
+            model=Client,
+            order_column="name_or_business",
         )
+        return await export.open(fmt)
 
     async def get_client(self, access_token: str, client_id: str) -> Client:
-        params = {"select": "*", "id": f"eq.{client_id}"}
+        params = {"select": CLIENT_COLUMNS, "id": f"eq.{client_id}"}
         response = await self._supabase.rest_request(
             "GET", "clients", access_token, params=params, headers={"Range": "0-0"}
         )
         data = response.data
         if isinstance(data, list) and data:
-            return Client.model_validate(data[0])
+            return validate_row(data[0], Client)
         raise AppError("Client not found", code="not_found", status_code=404)
 
     async def create_client(self, access_token: str, payload: ClientCreate) -> Client:
-        response = await self._supabase.rest_request(
-            "POST",
-            "clients",
-            access_token,
-            json=[payload.model_dump(by_alias=False)],
-            headers={"Prefer": "return=representation"},
-        )
+        try:
+            response = await self._supabase.rest_request(
+                "POST",
+                "clients",
+                access_token,
+                params={"select": CLIENT_COLUMNS},
+                json=[payload.model_dump(by_alias=False)],
+                headers={"Prefer": "return=representation"},
+            )
+        finally:
+            self._invalidate(access_token)
         data = response.data
         if isinstance(data, list) and data:
-            return Client.model_validate(data[0])
+            return validate_row(data[0], Client)
         raise AppError("Unable to create client", code="supabase_error", status_code=502)
 
     async def update_client(
         self, access_token: str, client_id: str, payload: ClientUpdate
     ) -> Client:
-        response = await self._supabase.rest_request(
-            "PATCH",
-            f"clients?id=eq.{client_id}",
-            access_token,
-            json=payload.model_dump(exclude_none=True, by_alias=False),
-            headers={"Prefer": "return=representation"},
-        )
+        try:
+            response = await self._supabase.rest_request(
+                "PATCH",
+                f"clients?id=eq.{client_id}",
+                access_token,
+                params={"select": CLIENT_COLUMNS},
+                json=payload.model_dump(exclude_none=True, by_alias=False),
+                headers={"Prefer": "return=representation"},
+            )
+        finally:
+            self._invalidate(access_token)
         data = response.data
         if isinstance(data, list) and data:
-            return Client.model_validate(data[0])
+            return validate_row(data[0], Client)
         raise AppError("Client not found", code="not_found", status_code=404)
 
     async def delete_client(self, access_token: str, client_id: str) -> None:
-        await self._supabase.rest_request("DELETE", f"clients?id=eq.{client_id}", access_token)
+        try:
+            await self._supabase.rest_request("DELETE", f"clients?id=eq.{client_id}", access_token)
+        finally:
+            self._invalidate(access_token)
 
 
 __all__ = ["ClientsService"]
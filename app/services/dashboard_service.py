@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.cache import ReadCache, cache_scope
+from app.core.errors import AppError
+from app.db.supabase_client import SupabaseClient
+from app.models.clients import PaymentState
+from app.models.dashboard import DashboardSummary
+from app.models.tasks import TaskStatus
+from app.services.pagination import head_count
+
+# Sums pending payments in the database (migrations/004).
+PENDING_AMOUNT_FUNCTION = "rpc/pending_payment_amount"
+
+
+class DashboardService:
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        cache: Optional[ReadCache] = None,
+        aggregates: bool = False,
+        user_id: Optional[str] = None,
+    ):
+        self._supabase = supabase
+        self._cache = cache
+        self._aggregates = aggregates
+        self._user_id = user_id
+
+    def _scope(self, access_token: str) -> str:
+        return cache_scope(access_token, self._user_id)
+
+    async def _count(self, access_token: str, table: str, params: Dict[str, str]) -> int:
+        total = await head_count(self._supabase, access_token, table, params)
+        if total is None:
+            raise AppError("Invalid response from Supabase", code="supabase_error", status_code=502)
+        return total
+
+    async def _pending_amount(self, access_token: str) -> float:
+        if self._aggregates:
+            # Needs PostgREST aggregate functions (db-aggregates-enabled) on the project.
+            response = await self._supabase.rest_request(
+                "GET",
+                "clients",
+                access_token,
+                params={
+                    "select": "total:payment_amount.sum()",
+                    "payment_state": f"eq.{PaymentState.pendiente.value}",
+                },
+            )
+            rows = response.data if isinstance(response.data, list) else []
+            return float(rows[0].get("total") or 0) if rows else 0.0
+
+        # Stable function, so PostgREST serves it on GET; it returns the sum as a bare number.
+        response = await self._supabase.rest_request("GET", PENDING_AMOUNT_FUNCTION, access_token)
+        return float(response.data or 0)
+
+    async def summary(self, access_token: str) -> DashboardSummary:
+        cache_key = ("dashboard",)
+        if self._cache is not None:
+            cached = self._cache.get(self._scope(access_token), cache_key)
+            if cached is not None:
+                return cached
+
+        now = datetime.now(timezone.utc).isoformat()
+        statuses = list(TaskStatus)
+        states = list(PaymentState)
+        # Every query is independent, so the summary costs the slowest one rather than the sum.
+        results = await asyncio.gather(
+            *[
+                self._count(access_token, "tasks", {"status": f"eq.{status.value}"})
+                for status in statuses
+            ],
+            self._count(
+                access_token,
+                "tasks",
+                {"due_date": f"lt.{now}", "status": f"neq.{TaskStatus.finalizado.value}"},
+            ),
+            *[
+                self._count(access_token, "clients", {"payment_state": f"eq.{state.value}"})
+                for state in states
+            ],
+            self._pending_amount(access_token),
+        )
+        task_counts = dict(zip(statuses, results[: len(statuses)]))
+        overdue = results[len(statuses)]
+        client_counts = dict(zip(states, results[len(statuses) + 1 : -1]))
+        result = DashboardSummary(
+            tasks_total=sum(task_counts.values()),
+            tasks_by_status=task_counts,
+            overdue_tasks=overdue,
+            clients_total=sum(client_counts.values()),
+            clients_by_payment_state=client_counts,
+            pending_payment_amount=results[-1],
+        )
+        if self._cache is not None:
+            self._cache.set(self._scope(access_token), cache_key, result)
+        return result
+
+
+__all__ = ["DashboardService"]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from app.db.streaming import JsonArraySplitter
+from app.db.supabase_client import SupabaseClient
+from app.models.common import ExportFormat
+from app.services.fields import model_columns
+from app.services.pagination import add_and_condition, keyset_condition
+
+# Rows per upstream request; Supabase caps a single response at its max_rows (1000 by default).
+EXPORT_PAGE_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class _CsvRenderer:
+    def __init__(self, model: Type[BaseModel]):
+        self.columns = [field.alias or name for name, field in model.model_fields.items()]
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def header(self) -> bytes:
+        self._writer.writerow(self.columns)
+        return self._drain()
+
+    def rows(self, rows: List[BaseModel]) -> bytes:
+        for row in rows:
+            values = row.model_dump(mode="json", by_alias=True)
+            self._writer.writerow([_csv_value(values.get(column)) for column in self.columns])
+        return self._drain()
+
+
+class TableExport:
+    """Streams every row of a table, walking keyset pages so each upstream body stays bounded."""
+
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        access_token: str,
+        *,
+        table: str,
+        model: Type[BaseModel],
+        order_column: str,
+        page_size: Optional[int] = None,
+    ):
+        self._supabase = supabase
+        self._access_token = access_token
+        self._table = table
+        self._model = model
+        self._order_column = order_column
+        self._page_size = page_size or EXPORT_PAGE_SIZE
+
+    def _params(self, after: Optional[BaseModel]) -> Dict[str, str]:
+        params = {
+            "select": model_columns(self._model),
+            "order": f"{self._order_column}.asc,id.asc",
+            "limit": str(self._page_size),
+        }
+        if after is not None:
+            last_value = getattr(after, self._order_column)
+            add_and_condition(params, keyset_condition(self._order_column, last_value, after.id))
+        return params
+
+    async def _page(self, after: Optional[BaseModel]) -> AsyncIterator[bytes]:
+        return await self._supabase.rest_stream(
+            self._table, self._access_token, params=self._params(after)
+        )
+
+    async def open(self, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        # Request the first page eagerly so upstream errors are raised before streaming starts.
+        first_page = await self._page(None)
+        return self._body(first_page, fmt)
+
+    async def _body(self, chunks: AsyncIterator[bytes], fmt: ExportFormat) -> AsyncIterator[bytes]:
+        renderer = _CsvRenderer(self._model) if fmt is ExportFormat.csv else None
+        if renderer is not None:
+            yield renderer.header()
+        while True:
+            splitter = JsonArraySplitter()
+            received = 0
+            last: Optional[BaseModel] = None
+            async for chunk in chunks:
+                rows = [self._model.model_validate_json(raw) for raw in splitter.feed(chunk)]
+                if not rows:
+                    continue
+                received += len(rows)
+                last = rows[-1]
+                # One output chunk per upstream chunk keeps writes (and compressor flushes) coarse.
+                if renderer is not None:
+                    yield renderer.rows(rows)
+                else:
+                    yield b"".join(
+                        row.model_dump_json(by_alias=True).encode() + b"\n" for row in rows
+                    )
+            if received < self._page_size:
+                return
+            chunks = await self._page(last)
+
+
+__all__ = ["EXPORT_MEDIA_TYPES", "EXPORT_PAGE_SIZE", "TableExport"]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+from app.core.errors import AppError
+
+
+def _field_lookup(model: Type[BaseModel]) -> Dict[str, str]:
+    lookup: Dict[str, str] = {}
+    for name, info in model.model_fields.items():
+        lookup[name] = name
+        if info.alias:
+            lookup[info.alias] = name
+    return lookup
+
+
+def model_columns(model: Type[BaseModel]) -> str:
+    """Explicit PostgREST select list for every field of ``model``, instead of ``*``."""
+    return ",".join(model.model_fields)
+
+
+def select_columns(
+    fields: Optional[str], model: Type[BaseModel], required: Sequence[str] = ("id",)
+) -> Optional[List[str]]:
+    """Map a ``fields=`` list (API or column names) to the PostgREST columns to select."""
+    if fields is None:
+        return None
+    lookup = _field_lookup(model)
+    columns = list(required)
+    for raw in fields.split(","):
+        name = raw.strip()
+        if not name:
+            continue
+        column = lookup.get(name)
+        if column is None:
+            raise AppError(f"Unknown field: {name}", code="invalid_fields", status_code=400)
+        if column not in columns:
+            columns.append(column)
+    return columns
+
+
+__all__ = ["model_columns", "select_columns"]
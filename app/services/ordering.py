@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Optional
+
+# Spacing between consecutive keys after a rebalance (rebalance_task_orders in migrations/003);
+# a fresh gap survives ~50 halvings.
+ORDER_STEP = 1024.0
+# Gaps below this fraction of the key magnitude are close to running out of precision.
+REBALANCE_GAP_RATIO = 1e-9
+
+
+def order_between(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    """Return a key strictly between the neighbours, or None when none is representable."""
+    if before is None and after is None:
+        return None
+    if before is None:
+        return after - ORDER_STEP
+    if after is None:
+        return before + ORDER_STEP
+    if after <= before:
+        return None
+    middle = before + (after - before) / 2
+    if not before < middle < after:
+        return None
+    return middle
+
+
+def needs_rebalance(before: Optional[float], after: Optional[float]) -> bool:
+    if before is None or after is None:
+        return False
+    scale = max(1.0, abs(before), abs(after))
+    return after - before < scale * REBALANCE_GAP_RATIO
+
+
+__all__ = ["ORDER_STEP", "order_between", "needs_rebalance"]
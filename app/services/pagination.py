@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.cache import ReadCache, cache_scope
+from app.core.errors import AppError
+from app.db.supabase_client import SupabaseClient
+from app.models.common import CountStrategy
+
+_background: Set["asyncio.Task[None]"] = set()
+
+
+def count_headers(strategy: CountStrategy) -> Dict[str, str]:
+    if strategy is CountStrategy.none:
+        return {}
+    return {"Prefer": f"count={strategy.value}"}
+
+
+def parse_total(headers, strategy: CountStrategy) -> Tuple[Optional[int], bool]:
+    """Read the Content-Range total and whether it is exact for the requested strategy."""
+    content_range = headers.get("content-range")
+    if not content_range:
+        return None, False
+    try:
+        _, total = content_range.split("/")
+        return int(total), strategy is CountStrategy.exact
+    except ValueError:
+        return None, False
+
+
+async def head_count(
+    supabase: SupabaseClient, access_token: str, table: str, params: Dict[str, str]
+) -> Optional[int]:
+    """Exact row count for ``params`` via a body-less HEAD request."""
+    response = await supabase.rest_request(
+        "HEAD",
+        table,
+        access_token,
+        params=params,
+        headers={"Prefer": "count=exact", "Range": "0-0"},
+    )
+    total, exact = parse_total(response.headers, CountStrategy.exact)
+    return total if exact else None
+
+
+class CachedTotals:
+    """Per-user exact totals refreshed in the background for lists served without a count."""
+
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        cache: ReadCache,
+        table: str,
+        user_id: Optional[str] = None,
+    ):
+        self._supabase = supabase
+        self._cache = cache
+        self._table = table
+        self._user_id = user_id
+
+    def _scope(self, access_token: str) -> str:
+        return cache_scope(access_token, self._user_id)
+
+    def _key(self, filter_params: Dict[str, str]) -> Tuple[Any, ...]:
+        return ("total", self._table, tuple(sorted(filter_params.items())))
+
+    def get(self, access_token: str, filter_params: Dict[str, str]) -> Optional[int]:
+        return self._cache.get(self._scope(access_token), self._key(filter_params))
+
+    def set(self, access_token: str, filter_params: Dict[str, str], total: int) -> None:
+        self._cache.set(self._scope(access_token), self._key(filter_params), total)
+
+    def refresh_later(self, access_token: str, filter_params: Dict[str, str]) -> None:
+        task = asyncio.ensure_future(self._refresh(access_token, dict(filter_params)))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+    async def _refresh(self, access_token: str, filter_params: Dict[str, str]) -> None:
+        try:
+            total = await head_count(self._supabase, access_token, self._table, filter_params)
+        except AppError:
+            return
+        if total is not None:
+            self.set(access_token, filter_params, total)
+
+
+def encode_cursor(kind: str, values: List[Any]) -> str:
+    raw = json.dumps([kind, *values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, kind: str) -> List[Any]:
+    """The ``[sort value, id]`` pair of a ``kind`` cursor; 400 for anything else."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        decoded = json.loads(raw)
+    except (binascii.Error, ValueError):
+        decoded = None
+    if (
+        not isinstance(decoded, list)
+        or len(decoded) != 3
+        or decoded[0] != kind
+        or not all(_is_scalar(value) for value in decoded[1:])
+    ):
+        raise AppError("Invalid cursor", code="invalid_cursor", status_code=400)
+    return decoded[1:]
+
+
+def quote_value(value: Any) -> str:
+    """Render a value for a PostgREST logic tree, quoting strings so reserved chars are safe."""
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return json.dumps(value)
+
+
+def keyset_condition(column: str, value: Any, row_id: str) -> str:
+    """Rows strictly after ``(value, row_id)`` in ``column.asc,id.asc`` order."""
+    quoted = quote_value(value)
+    return f"or({column}.gt.{quoted},and({column}.eq.{quoted},id.gt.{quote_value(row_id)}))"
+
+
+def add_and_condition(params: Dict[str, str], condition: str) -> None:
+    existing = params.get("and")
+    params["and"] = f"({existing[1:-1]},{condition})" if existing else f"({condition})"
+
+
+__all__ = [
+    "CachedTotals",
+    "count_headers",
+    "head_count",
+    "parse_total",
+    "encode_cursor",
+    "decode_cursor",
+    "quote_value",
+    "keyset_condition",
+    "add_and_condition",
+]
@@ -1,26 +1,76 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
+from fastapi import BackgroundTasks
+
+from app.core.cache import ReadCache, cache_scope
 from app.core.errors import AppError
 from app.db.supabase_client import SupabaseClient
-from app.models.tasks import Task, TaskCreate, TaskFilters, TaskList, TaskStatus, TaskUpdate
+from app.models.common import CountStrategy, ExportFormat
+from app.models.tasks import (
+    Task,
+    TaskBatchItemResult,
+    TaskBatchOperation,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBatchUpdate,
+    TaskCreate,
+    TaskFilters,
+    TaskList,
+    TaskMove,
+    TaskPartial,
+    TaskPartialList,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.services.ordering import ORDER_STEP, needs_rebalance, order_between
+from app.services.export import TableExport
+from app.services.pagination import (
+    CachedTotals,
+    add_and_condition,
+    count_headers,
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    parse_total,
+    quote_value,
+)
+from app.services.validation import ValidationMode, validate_row, validate_rows
+
+REBALANCE_FUNCTION = "rpc/rebalance_task_orders"
+UPDATE_FUNCTION = "rpc/update_tasks"
 
 
 class TasksService:
-    def __init__(self, supabase: SupabaseClient):
+    def __init__(
+        self,
+        supabase: SupabaseClient,
+        cache: Optional[ReadCache] = None,
+        validation: ValidationMode = "json",
+        user_id: Optional[str] = None,
+    ):
         self._supabase = supabase
+        self._cache = cache
+        self._validation = validation
+        self._user_id = user_id
+        self._totals = (
+            CachedTotals(supabase, cache, "tasks", user_id) if cache is not None else None
+        )
+
+    def _scope(self, access_token: str) -> str:
+        return cache_scope(access_token, self._user_id)
+
+    def _invalidate(self, access_token: str) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(self._scope(access_token))
 
     @staticmethod
-    def _parse_total(headers) -> int:
-        content_range = headers.get("content-range")
-        if not content_range:
-            return 0
-        try:
-            _, total = content_range.split("/")
-            return int(total)
-        except ValueError:
-            return 0
+    def _parse_total(
+        headers, strategy: CountStrategy = CountStrategy.exact
+    ) -> Tuple[Optional[int], bool]:
+        return parse_total(headers, strategy)
 
     def _build_filters(self, filters: TaskFilters | None) -> Dict[str, str]:
         params: Dict[str, str] = {}
@@ -36,7 +86,10 @@ class TasksService:
         if range_parts:
             params["and"] = f"({','.join(range_parts)})"
         if filters.q:
-            params["or"] = f"(title.ilike.*{filters.q}*,description.ilike.*{filters.q}*)"
+            # Substring match served by the pg_trgm indexes (migrations/002); quoted so commas and
+            # parentheses in the query cannot break the logic tree.
+            pattern = quote_value(f"*{filters.q}*")
+            params["or"] = f"(title.ilike.{pattern},description.ilike.{pattern})"
         return params
 
     async def list_tasks(
@@ -46,25 +99,89 @@ class TasksService:
         page: int = 1,
         page_size: int = 20,
         filters: Optional[TaskFilters] = None,
-    ) -> TaskList:
-        start = (page - 1) * page_size
-        end = start + page_size - 1
-        params: Dict[str, str] = {"select": "*", "order": "order"}
-        params.update(self._build_filters(filters))
-        headers = {"Range": f"{start}-{end}", "Prefer": "count=exact"}
+        cursor: Optional[str] = None,
+        count: CountStrategy = CountStrategy.exact,
+        fields: Optional[List[str]] = None,
+    ) -> Union[TaskList, TaskPartialList]:
+        filter_params = self._build_filters(filters)
+        cache_key = (
+            "tasks",
+            page,
+            page_size,
+            cursor,
+            count.value,
+            tuple(fields or ()),
+            tuple(sorted(filter_params.items())),
+        )
+        if self._cache is not None:
+            cached = self._cache.get(self._scope(access_token), cache_key)
+            if cached is not None:
+                return cached
+
+        columns = list(fields) if fields else None
+        if columns and cursor is not None and "order" not in columns:
+            columns.append("order")
+        select = ",".join(columns) if columns else "*"
+        params: Dict[str, str] = {"select": select, "order": "order"}
+        params.update(filter_params)
+        headers: Dict[str, str] = {}
+        page_count = count
+        if cursor is None:
+            start = (page - 1) * page_size
+            headers["Range"] = f"{start}-{start + page_size - 1}"
+        else:
+            # Keyset mode: seek past the last (order, id) seen instead of skipping rows.
+            params["order"] = "order.asc,id.asc"
+            params["limit"] = str(page_size + 1)
+            if cursor:
+                last_order, last_id = decode_cursor(cursor, "tasks")
+                add_and_condition(params, keyset_condition("order", last_order, last_id))
+                # A count here would only see the rows past the cursor; the list total
+                # comes from CachedTotals over the unseeked filters instead.
+                page_count = CountStrategy.none
+        headers.update(count_headers(page_count))
         response = await self._supabase.rest_request(
             "GET", "tasks", access_token, params=params, headers=headers
         )
-        data = response.data
-        if not isinstance(data, list):
-            raise AppError("Invalid response from Supabase", code="supabase_error", status_code=502)
-        total = self._parse_total(response.headers)
-        return TaskList(
-            items=[Task.model_validate(i) for i in data],
+        list_model, item_model = (TaskPartialList, TaskPartial) if fields else (TaskList, Task)
+        items = validate_rows(response, item_model, self._validation)
+        next_cursor = None
+        if cursor is not None and len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor("tasks", [items[-1].order, items[-1].id])
+        total, total_exact = self._parse_total(response.headers, page_count)
+        if total_exact and self._totals is not None:
+            self._totals.set(access_token, filter_params, total)
+        elif self._totals is not None:
+            cached_total = self._totals.get(access_token, filter_params)
+            if cached_total is None:
+                self._totals.refresh_later(access_token, filter_params)
+            else:
+                total, total_exact = cached_total, True
+        if total is None:
+            offset = (page - 1) * page_size if cursor is None else 0
+            total = offset + len(items)
+        result = list_model(
+            items=items,
             total=total,
             page=page,
             page_size=page_size,
+            next_cursor=next_cursor,
+            total_exact=total_exact,
         )
+        if self._cache is not None and total_exact:
+            self._cache.set(self._scope(access_token), cache_key, result)
+        return result
+
+    async def export_tasks(self, access_token: str, fmt: ExportFormat) -> AsyncIterator[bytes]:
+        export = TableExport(
+            self._supabase,
+            access_token,
+            table="tasks",
+            model=Task,
+            order_column="order",
+        )
+        return await export.open(fmt)
 
     async def get_task(self, access_token: str, task_id: str) -> Task:
         response = await self._supabase.rest_request(
@@ -76,41 +193,258 @@ class TasksService:
         )
         data = response.data
         if isinstance(data, list) and data:
-            return Task.model_validate(data[0])
+            return validate_row(data[0], Task)
         raise AppError("Task not found", code="not_found", status_code=404)
 
     async def create_task(self, access_token: str, payload: TaskCreate) -> Task:
-        response = await self._supabase.rest_request(
-            "POST",
-            "tasks",
-            access_token,
-            json=[payload.model_dump(by_alias=False, exclude_none=True)],  #PARCHE:1
-            headers={"Prefer": "return=representation"},
-        )
+        try:
+            response = await self._supabase.rest_request(
+                "POST",
+                "tasks",
+                access_token,
+                json=[payload.model_dump(by_alias=False, exclude_none=True)],  #PARCHE:1
+                headers={"Prefer": "return=representation"},
+            )
+        finally:
+            self._invalidate(access_token)
         data = response.data
         if isinstance(data, list) and data:
-            return Task.model_validate(data[0])
+            return validate_row(data[0], Task)
         raise AppError("Unable to create task", code="supabase_error", status_code=502)
 
     async def update_task(self, access_token: str, task_id: str, payload: TaskUpdate) -> Task:
-        response = await self._supabase.rest_request(
-            "PATCH",
-            f"tasks?id=eq.{task_id}",
-            access_token,
-            json=payload.model_dump(exclude_none=True, by_alias=False),
-            headers={"Prefer": "return=representation"},
-        )
+        try:
+            response = await self._supabase.rest_request(
+                "PATCH",
+                f"tasks?id=eq.{task_id}",
+                access_token,
+                json=payload.model_dump(exclude_none=True, by_alias=False),
+                headers={"Prefer": "return=representation"},
+            )
+        finally:
+            self._invalidate(access_token)
         data = response.data
         if isinstance(data, list) and data:
-            return Task.model_validate(data[0])
+            return validate_row(data[0], Task)
         raise AppError("Task not found", code="not_found", status_code=404)
 
     async def delete_task(self, access_token: str, task_id: str) -> None:
-        await self._supabase.rest_request("DELETE", f"tasks?id=eq.{task_id}", access_token)
+        try:
+            await self._supabase.rest_request("DELETE", f"tasks?id=eq.{task_id}", access_token)
+        finally:
+            self._invalidate(access_token)
 
     async def complete_task(self, access_token: str, task_id: str) -> Task:
         payload = TaskUpdate(status=TaskStatus.finalizado)
         return await self.update_task(access_token, task_id, payload)
 
+    async def move_task(
+        self,
+        access_token: str,
+        task_id: str,
+        move: TaskMove,
+        background_tasks: Optional[BackgroundTasks] = None,
+    ) -> Task:
+        neighbour_ids = [i for i in (move.before_id, move.after_id) if i]
+        if task_id in neighbour_ids:
+            raise AppError(
+                "A task cannot be moved next to itself", code="invalid_move", status_code=422
+            )
+        if not neighbour_ids:
+            if move.status is None:
+                raise AppError(
+                    "beforeId, afterId or status is required", code="invalid_move", status_code=422
+                )
+            return await self.update_task(access_token, task_id, TaskUpdate(status=move.status))
+
+        before, after = await self._neighbour_orders(access_token, move)
+        if before is not None and after is not None and after < before:
+            raise AppError("Neighbours are out of order", code="invalid_move", status_code=409)
+        order = order_between(before, after)
+        if order is None:
+            # Equal keys or no representable midpoint: respace synchronously and retry once.
+            await self.rebalance_orders(access_token)
+            before, after = await self._neighbour_orders(access_token, move)
+            order = order_between(before, after)
+            if order is None:
+                raise AppError("Neighbours are out of order", code="invalid_move", status_code=409)
+        elif background_tasks is not None and needs_rebalance(before, after):
+            background_tasks.add_task(self.rebalance_orders, access_token)
+
+        return await self.update_task(
+            access_token, task_id, TaskUpdate(order=order, status=move.status)
+        )
+
+    async def _neighbour_orders(
+        self, access_token: str, move: TaskMove
+    ) -> Tuple[Optional[float], Optional[float]]:
+        ids = [i for i in (move.before_id, move.after_id) if i]
+        response = await self._supabase.rest_request(
+            "GET",
+            "tasks",
+            access_token,
+            params={"select": "id,order", "id": f"in.({','.join(ids)})"},
+        )
+        orders = {row["id"]: float(row["order"]) for row in response.data or []}
+        if any(i not in orders for i in ids):
+            raise AppError("Task not found", code="not_found", status_code=404)
+        before = orders[move.before_id] if move.before_id else None
+        after = orders[move.after_id] if move.after_id else None
+        return before, after
+
+    async def rebalance_orders(self, access_token: str) -> None:
+        """Respace every task's order key evenly, keeping the current sequence."""
+        try:
+            await self._supabase.rest_request(
+                "POST", REBALANCE_FUNCTION, access_token, json={"step": ORDER_STEP}
+            )
+        finally:
+            self._invalidate(access_token)
+
+    async def batch_tasks(self, access_token: str, batch: TaskBatchRequest) -> TaskBatchResponse:
+        try:
+            created, updated, deleted = await asyncio.gather(
+                self._batch_create(access_token, batch.creates),
+                self._batch_update(access_token, batch.updates),
+                self._batch_delete(access_token, batch.deletes),
+            )
+        finally:
+            self._invalidate(access_token)
+        return TaskBatchResponse(results=created + updated + deleted)
+
+    @staticmethod
+    def _batch_errors(
+        op: TaskBatchOperation, ids: List[Optional[str]], exc: AppError
+    ) -> List[TaskBatchItemResult]:
+        return [
+            TaskBatchItemResult(
+                op=op,
+                index=index,
+                id=task_id,
+                status=exc.status_code,
+                code=exc.code,
+                detail=exc.detail,
+            )
+            for index, task_id in enumerate(ids)
+        ]
+
+    async def _batch_create(
+        self, access_token: str, creates: List[TaskCreate]
+    ) -> List[TaskBatchItemResult]:
+        if not creates:
+            return []
+        rows = [c.model_dump(by_alias=False, exclude_none=True, mode="json") for c in creates]
+        # Bulk inserts take their column list from the first object unless told otherwise.
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        try:
+            response = await self._supabase.rest_request(
+                "POST",
+                "tasks",
+                access_token,
+                params={"columns": ",".join(columns)},
+                json=rows,
+                headers={"Prefer": "return=representation,missing=default"},
+            )
+        except AppError as exc:
+            return self._batch_errors(TaskBatchOperation.create, [None] * len(creates), exc)
+        data = response.data if isinstance(response.data, list) else []
+        results = []
+        for index in range(len(creates)):
+            if index < len(data):
+                task = validate_row(data[index], Task)
+                results.append(
+                    TaskBatchItemResult(
+                        op=TaskBatchOperation.create, index=index, id=task.id, status=201, task=task
+                    )
+                )
+            else:
+                results.append(
+                    TaskBatchItemResult(
+                        op=TaskBatchOperation.create,
+                        index=index,
+                        status=502,
+                        code="supabase_error",
+                        detail="Unable to create task",
+                    )
+                )
+        return results
+
+    async def _batch_update(
+        self, access_token: str, updates: List[TaskBatchUpdate]
+    ) -> List[TaskBatchItemResult]:
+        if not updates:
+            return []
+        # Later updates to the same task win, as if they were applied in order.
+        changes: Dict[str, Dict[str, Any]] = {}
+        for update in updates:
+            change = update.model_dump(
+                exclude_none=True, exclude={"id"}, by_alias=False, mode="json"
+            )
+            changes.setdefault(update.id, {}).update(change)
+        ids = list(changes)
+        try:
+            first = changes[ids[0]]
+            if all(change == first for change in changes.values()):
+                # Same change for every task (e.g. bulk status move): one filtered PATCH.
+                response = await self._supabase.rest_request(
+                    "PATCH",
+                    f"tasks?id=in.({','.join(ids)})",
+                    access_token,
+                    json=first,
+                    headers={"Prefer": "return=representation"},
+                )
+            else:
+                # Different changes per task (e.g. drag reorder): one call applying each task's
+                # own columns in the database (migrations/005), so other columns are untouched.
+                response = await self._supabase.rest_request(
+                    "POST",
+                    UPDATE_FUNCTION,
+                    access_token,
+                    json={"changes": [{"id": i, **change} for i, change in changes.items()]},
+                )
+        except AppError as exc:
+            return self._batch_errors(TaskBatchOperation.update, [u.id for u in updates], exc)
+        data = response.data if isinstance(response.data, list) else []
+        updated = {row["id"]: validate_row(row, Task) for row in data}
+
+        results = []
+        for index, update in enumerate(updates):
+            task_id = update.id
+            task = updated.get(task_id)
+            if task is None:
+                results.append(
+                    TaskBatchItemResult(
+                        op=TaskBatchOperation.update,
+                        index=index,
+                        id=task_id,
+                        status=404,
+                        code="not_found",
+                        detail="Task not found",
+                    )
+                )
+            else:
+                results.append(
+                    TaskBatchItemResult(
+                        op=TaskBatchOperation.update, index=index, id=task_id, status=200, task=task
+                    )
+                )
+        return results
+
+    async def _batch_delete(
+        self, access_token: str, deletes: List[str]
+    ) -> List[TaskBatchItemResult]:
+        if not deletes:
+            return []
+        try:
+            await self._supabase.rest_request(
+                "DELETE", f"tasks?id=in.({','.join(dict.fromkeys(deletes))})", access_token
+            )
+        except AppError as exc:
+            return self._batch_errors(TaskBatchOperation.delete, list(deletes), exc)
+        return [
+            TaskBatchItemResult(op=TaskBatchOperation.delete, index=index, id=task_id, status=204)
+            for index, task_id in enumerate(deletes)
+        ]
+
 
 __all__ = ["TasksService"]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, List, Literal, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.core import timing
+from app.core.errors import AppError
+from app.db.supabase_client import SupabaseResponse
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# per_row: model_validate each decoded row; list: one TypeAdapter call over the decoded rows;
+# json: one TypeAdapter call straight from the response bytes, skipping json.loads entirely.
+ValidationMode = Literal["per_row", "list", "json"]
+
+
+@lru_cache(maxsize=None)
+def rows_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def validate_rows(
+    response: SupabaseResponse, model: Type[ModelT], mode: ValidationMode = "json"
+) -> List[ModelT]:
+    """Validate an upstream array of rows into ``model`` instances."""
+    with timing.timed("validation"):
+        return _validate_rows(response, model, mode)
+
+
+def validate_row(row: Any, model: Type[ModelT]) -> ModelT:
+    """Validate one upstream row into ``model``, timed like ``validate_rows``."""
+    with timing.timed("validation"):
+        return model.model_validate(row)
+
+
+def _validate_rows(
+    response: SupabaseResponse, model: Type[ModelT], mode: ValidationMode
+) -> List[ModelT]:
+    try:
+        if mode == "json" and response.content:
+            return rows_adapter(model).validate_json(response.content)
+        data = response.data
+        if not isinstance(data, list):
+            raise AppError("Invalid response from Supabase", code="supabase_error", status_code=502)
+        if mode == "per_row":
+            return [model.model_validate(row) for row in data]
+        return rows_adapter(model).validate_python(data)
+    except ValidationError as exc:
+        raise AppError(
+            "Invalid response from Supabase", code="supabase_error", status_code=502
+        ) from exc
+
+
+__all__ = ["ValidationMode", "rows_adapter", "validate_row", "validate_rows"]
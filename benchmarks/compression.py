@@ -0,0 +1,51 @@
+"""Compare CPU time and wire size of each response encoder on a 100-item client page.
+
+Run from the repository root: ``python -m benchmarks.compression [--items 100]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from app.core.compression import available_encodings, make_encoder
+from benchmarks.fixtures import client_page
+
+LEVELS: Dict[str, List[int]] = {
+    "gzip": [1, 6, 9],
+    "br": [1, 4, 6, 11],
+    "zstd": [1, 3, 9, 19],
+}
+
+
+def measure(encoding: str, level: int, body: bytes, rounds: int) -> Tuple[int, float]:
+    size = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        encoder = make_encoder(encoding, {encoding: level})
+        size = len(encoder.compress(body) + encoder.finish())
+    elapsed = (time.perf_counter() - started) / rounds
+    return size, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    body = client_page(args.items).model_dump_json(by_alias=True).encode()
+    print(f"identity   {len(body):>8} bytes")
+    print(f"{'encoding':<10} {'level':>5} {'bytes':>8} {'ratio':>6} {'ms':>8}")
+    for encoding in available_encodings():
+        for level in LEVELS[encoding]:
+            size, elapsed = measure(encoding, level, body, args.rounds)
+            ratio = size / len(body)
+            print(f"{encoding:<10} {level:>5} {size:>8} {ratio:>6.1%} {elapsed * 1000:>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
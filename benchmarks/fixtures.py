@@ -0,0 +1,83 @@
+"""Representative payloads shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from app.models.clients import Client, ClientList
+from app.models.tasks import Task, TaskList
+
+
+def client_row(index: int) -> Dict[str, Any]:
+    return {
+        "id": f"00000000-0000-4000-8000-{index:012d}",
+        "name_or_business": f"Cliente {index} S.A.S.",
+        "identificacion": f"900{index:06d}",
+        "contact": f"contacto{index}@example.com",
+        "notes": "Declaración bimestral de IVA y retención en la fuente." if index % 3 else None,
+        "payment_state": "pagado" if index % 2 else "pendiente",
+        "payment_amount": 150000.0 + index * 1250.5,
+        "tags": ["iva", "renta"] if index % 2 else ["exogena"],
+        "documents": [
+            {
+                "id": f"doc-{index}",
+                "name": f"rut-{index}.pdf",
+                "type": "application/pdf",
+                "size_bytes": 48213 + index,
+                "path": f"clients/{index}/rut.pdf",
+            }
+        ],
+        "tax_profile": {
+            "identificacion_tipo": "NIT",
+            "periodicidad_iva": "bimestral",
+            "ica_municipio": "Bogotá",
+            "ica_periodicidad": "bimestral",
+            "aplica_renta": True,
+            "aplica_rete_fuente": True,
+            "aplica_exogena": index % 4 == 0,
+            "usar_dv_en_calculo": False,
+        },
+    }
+
+
+def client_rows(count: int = 100) -> List[Dict[str, Any]]:
+    return [client_row(index) for index in range(count)]
+
+
+def client_page(count: int = 100) -> ClientList:
+    items = [Client.model_validate(row) for row in client_rows(count)]
+    return ClientList(items=items, total=count * 10, page=1, page_size=count)
+
+
+def task_row(index: int) -> Dict[str, Any]:
+    return {
+        "id": f"10000000-0000-4000-8000-{index:012d}",
+        "title": f"Presentar declaración {index}",
+        "description": "Revisar soportes y radicar en la DIAN." if index % 2 else None,
+        "status": ("sin_iniciar", "en_proceso", "finalizado")[index % 3],
+        "labels": ["iva"] if index % 2 else ["renta", "urgente"],
+        "due_date": f"2024-{index % 12 + 1:02d}-15T17:00:00Z",
+        "add_to_calendar": index % 5 == 0,
+        "created_at": "2024-01-01T08:00:00Z",
+        "updated_at": "2024-01-02T09:30:00Z",
+        "order": (index + 1) * 1024.0,
+    }
+
+
+def task_rows(count: int = 100) -> List[Dict[str, Any]]:
+    return [task_row(index) for index in range(count)]
+
+
+def task_page(count: int = 100) -> TaskList:
+    items = [Task.model_validate(row) for row in task_rows(count)]
+    return TaskList(items=items, total=count * 10, page=1, page_size=count)
+
+
+__all__ = [
+    "client_row",
+    "client_rows",
+    "client_page",
+    "task_row",
+    "task_rows",
+    "task_page",
+]
@@ -0,0 +1,357 @@
+"""Drive a realistic request mix through the real app against a stub Supabase.
+
+The stub (``benchmarks.stub_upstream``) runs in its own process with configurable latency and
+list sizes. The app runs either in this process behind ``httpx.ASGITransport``
+(``--mode inprocess``, the default) or as a uvicorn subprocess (``--mode uvicorn``), which
+also pays for the HTTP server. Each of ``--concurrency`` workers loops over the weighted mix
+until ``--duration`` elapses.
+
+Throughput and p50/p95/p99 per route are printed and written to ``--output`` as JSON, with the
+commit and options, so two runs can be diffed:
+
+    python -m benchmarks.loadtest --duration 20 --output before.json
+    python -m benchmarks.loadtest --duration 20 --output after.json --env HEDGE_READS=true
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks import stub_upstream
+
+TASK_ID = "10000000-0000-4000-8000-000000000001"
+DEFAULT_MIX = "list=40,get=20,create=10,update=10,complete=10,me=10"
+# Generous enough that rate limiting never shapes the measurement.
+UNLIMITED = "1000000/minute"
+
+Operation = Callable[[httpx.AsyncClient], Any]
+
+OPERATIONS: Dict[str, Tuple[str, Operation]] = {
+    "list": (
+        "GET /tasks",
+        lambda client: client.get("/tasks", params={"page": random.randint(1, 5)}),
+    ),
+    "get": ("GET /tasks/{task_id}", lambda client: client.get(f"/tasks/{TASK_ID}")),
+    "create": (
+        "POST /tasks",
+        lambda client: client.post(
+            "/tasks", json={"title": "Radicar IVA", "status": "sin_iniciar", "order": 1024}
+        ),
+    ),
+    "update": (
+        "PUT /tasks/{task_id}",
+        lambda client: client.put(f"/tasks/{TASK_ID}", json={"title": "Radicar renta"}),
+    ),
+    "complete": (
+        "POST /tasks/{task_id}/complete",
+        lambda client: client.post(f"/tasks/{TASK_ID}/complete"),
+    ),
+    "me": ("GET /auth/me", lambda client: client.get("/auth/me")),
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise SystemExit(f"unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def add(self, route: str, status: str, seconds: float) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        by_status = self.statuses.setdefault(route, {})
+        by_status[status] = by_status.get(status, 0) + 1
+        if not status.startswith("2"):
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        routes = {
+            route: {
+                **summarize(latencies, self.errors.get(route, 0), elapsed),
+                "statuses": self.statuses[route],
+            }
+            for route, latencies in sorted(self.latencies.items())
+        }
+        everything = [value for values in self.latencies.values() for value in values]
+        return {
+            "routes": routes,
+            "total": summarize(everything, sum(self.errors.values()), elapsed),
+        }
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    deadline: float,
+    recorder: Optional[Recorder],
+    rng: random.Random,
+) -> None:
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        route, operation = OPERATIONS[rng.choices(names, weights)[0]]
+        started = time.perf_counter()
+        try:
+            response = await operation(client)
+            status = str(response.status_code)
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        if recorder is not None:
+            recorder.add(route, status, time.perf_counter() - started)
+
+
+async def drive(
+    client: httpx.AsyncClient, mix: Dict[str, float], concurrency: int, duration: float, seed: int
+) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(
+        *[
+            worker(client, mix, deadline, recorder, random.Random(seed + index))
+            for index in range(concurrency)
+        ]
+    )
+    return recorder, time.perf_counter() - started
+
+
+async def _read_port(process: asyncio.subprocess.Process) -> int:
+    assert process.stdout is not None
+    line = (await asyncio.wait_for(process.stdout.readline(), timeout=30)).decode()
+    if not line.startswith("listening on "):
+        raise SystemExit(f"stub upstream failed to start: {line!r}")
+    return int(line.rsplit(" ", 1)[1])
+
+
+@asynccontextmanager
+async def stub_server(args: argparse.Namespace) -> AsyncIterator[str]:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.stub_upstream",
+        "--latency-ms",
+        str(args.latency_ms),
+        "--jitter-ms",
+        str(args.jitter_ms),
+        "--slow-ratio",
+        str(args.slow_ratio),
+        "--slow-ms",
+        str(args.slow_ms),
+        "--rows",
+        str(args.rows),
+        "--total",
+        str(args.total),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    try:
+        yield f"http://127.0.0.1:{await _read_port(process)}"
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+def app_environment(upstream: str, overrides: List[str]) -> Dict[str, str]:
+    env = {
+        "SUPABASE_URL": upstream,
+        "SUPABASE_ANON_KEY": "bench-anon-key",
+        "APP_ENV": "bench",
+        "LOG_LEVEL": "WARNING",
+        "RATE_LIMIT": UNLIMITED,
+        "RATE_LIMIT_PER_IP": UNLIMITED,
+        "RATE_LIMIT_LIST": UNLIMITED,
+        "RATE_LIMIT_SEARCH": UNLIMITED,
+        "RATE_LIMIT_EXPORT": UNLIMITED,
+        "RATE_LIMIT_BATCH": UNLIMITED,
+    }
+    for override in overrides:
+        name, _, value = override.partition("=")
+        env[name.strip().upper()] = value
+    return env
+
+
+@asynccontextmanager
+async def inprocess_app(env: Dict[str, str]) -> AsyncIterator[httpx.AsyncClient]:
+    os.environ.update(env)
+    # Imported late: app.main builds its module-level app from the environment at import.
+    from app.core.config import get_settings
+    from app.main import create_app
+
+    get_settings.cache_clear()
+    application = create_app()
+    async with application.router.lifespan_context(application):
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bff", headers=_auth_headers()
+        ) as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_app(env: Dict[str, str], port: int) -> AsyncIterator[httpx.AsyncClient]:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        env={**os.environ, **env},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, headers=_auth_headers(), limits=limits, timeout=30
+        ) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/docs")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise SystemExit("uvicorn did not start")
+            yield client
+    finally:
+        process.terminate()
+        await process.wait()
+
+
+def _auth_headers() -> Dict[str, str]:
+    # Set the cookie header directly: the app's auth cookies are Secure and httpx would not
+    # send them over plain http.
+    return {"Cookie": "sb-access-token=bench-access-token"}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'route':<32} {'reqs':>7} {'err':>5} {'rps':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = list(report["routes"].items()) + [("total", report["total"])]
+    for route, stats in rows:
+        print(
+            f"{route:<32} {stats['requests']:>7} {stats['errors']:>5} "
+            f"{stats['throughput_rps']:>9.1f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    async with stub_server(args) as upstream:
+        env = app_environment(upstream, args.env)
+        if args.mode == "uvicorn":
+            app_client = uvicorn_app(env, args.port)
+        else:
+            app_client = inprocess_app(env)
+        async with app_client as client:
+            if args.warmup > 0:
+                await drive(client, mix, args.concurrency, args.warmup, args.seed)
+            recorder, elapsed = await drive(client, mix, args.concurrency, args.duration, args.seed)
+    report = recorder.report(elapsed)
+    report["meta"] = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 3),
+        "mix": mix,
+        "upstream": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "slow_ratio": args.slow_ratio,
+            "slow_ms": args.slow_ms,
+            "rows": args.rows,
+            "total": args.total,
+        },
+        "env": args.env,
+    }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--port", type=int, default=8765, help="app port in uvicorn mode")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to measure")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted operations, e.g. list=3,me=1")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="app setting override, repeatable",
+    )
+    parser.add_argument("--output", help="write the JSON report here")
+    stub_upstream.add_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
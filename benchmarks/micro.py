@@ -0,0 +1,295 @@
+"""Micro-benchmarks for model and service hot paths, checked against a stored baseline.
+
+Each case times one call on fixed inputs from ``benchmarks.fixtures``. Every round times a
+fixed calibration workload right before the case, and cases are compared against the
+baseline by the median case/calibration ratio over ``--rounds`` rounds in each of
+``--processes`` fresh interpreters. Drift between rounds cancels out of each ratio, the median
+discards outlier rounds, and a case is only reported as a regression when independent
+re-measurements agree.
+
+Run from the repository root:
+
+    python -m benchmarks.micro                  # print timings against the baseline
+    python -m benchmarks.micro --check          # exit 1 if any case regressed past --threshold
+    python -m benchmarks.micro --save           # record benchmarks/baseline.json
+
+Re-save the baseline when a slowdown is intended, or when it moves to a different runner.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from statistics import median, quantiles
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from httpx import Headers
+
+from app.models.clients import Client
+from app.models.common import CountStrategy
+from app.models.tasks import TaskFilters, TaskStatus
+from app.services.tasks_service import TasksService
+from benchmarks.fixtures import client_row, task_page
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_ROUNDS = 15
+DEFAULT_PROCESSES = 4
+# Minimum duration of each timed batch of calls; short batches are dominated by timer noise.
+BATCH_SECONDS = 0.01
+# A case over the threshold is re-measured from scratch this many times, and only counts as a
+# regression if every re-measurement is over the threshold too.
+CONFIRM_RUNS = 2
+
+Bench = Callable[[], Any]
+
+
+def client_model_validate() -> Bench:
+    row = client_row(7)
+
+    return lambda: Client.model_validate(row)
+
+
+def task_list_dump_json() -> Bench:
+    page = task_page(100)
+
+    return lambda: page.model_dump_json(by_alias=True)
+
+
+def tasks_build_filters() -> Bench:
+    service = TasksService(supabase=None)  # type: ignore[arg-type]
+    filters = TaskFilters(
+        status=TaskStatus.en_proceso,
+        due_from=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        due_to=datetime(2024, 12, 31, tzinfo=timezone.utc),
+        q="declaración (IVA), bimestre",
+    )
+
+    return lambda: service._build_filters(filters)
+
+
+def tasks_parse_total() -> Bench:
+    headers = Headers({"content-range": "0-19/12840", "content-type": "application/json"})
+
+    return lambda: TasksService._parse_total(headers, CountStrategy.exact)
+
+
+def cors_origin_match() -> Bench:
+    # app.main builds a module-level app from the environment on import.
+    os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+    os.environ.setdefault("SUPABASE_ANON_KEY", "anon")
+    from starlette.middleware.cors import CORSMiddleware
+
+    from app.core.config import Settings
+    from app.main import create_app
+
+    settings = Settings(
+        supabase_url="https://example.supabase.co",
+        supabase_anon_key="anon",
+        allowed_origins=[
+            "https://app.example.com",
+            "http://localhost:3000",
+            "http://192.168.1.10:8080",
+        ],
+    )
+    application = create_app(settings)
+    options = next(m.kwargs for m in application.user_middleware if m.cls is CORSMiddleware)
+    cors = CORSMiddleware(app=application, **options)
+    origins = ["http://localhost:52341", "https://app.example.com", "https://evil.example.net"]
+
+    def match() -> None:
+        for origin in origins:
+            cors.is_allowed_origin(origin)
+
+    return match
+
+
+CASES: Dict[str, Callable[[], Bench]] = {
+    "client_model_validate": client_model_validate,
+    "task_list_dump_json": task_list_dump_json,
+    "tasks_build_filters": tasks_build_filters,
+    "tasks_parse_total": tasks_parse_total,
+    "cors_origin_match": cors_origin_match,
+}
+
+
+def _calibration() -> Any:
+    # Mixes interpreter and C-level work, like the cases (pydantic-core, orjson, httpx).
+    rows = [{"id": index, "name": f"row-{index}", "tags": ["a", "b"]} for index in range(20)]
+    return json.loads(json.dumps(rows))
+
+
+def _calls_per_batch(timer: timeit.Timer) -> int:
+    number = 1
+    while timer.timeit(number) < BATCH_SECONDS:
+        number *= 2
+    return number
+
+
+def sample(bench: Bench, rounds: int) -> Dict[str, List[float]]:
+    """Seconds per call and case/calibration ratios, one of each per round."""
+    case_timer, calibration_timer = timeit.Timer(bench), timeit.Timer(_calibration)
+    case_number = _calls_per_batch(case_timer)
+    calibration_number = _calls_per_batch(calibration_timer)
+    samples: Dict[str, List[float]] = {"seconds": [], "ratios": []}
+    for _ in range(rounds):
+        calibration = calibration_timer.timeit(calibration_number) / calibration_number
+        case = case_timer.timeit(case_number) / case_number
+        samples["seconds"].append(case)
+        samples["ratios"].append(case / calibration)
+    return samples
+
+
+def summarise(samples: Dict[str, List[float]]) -> Dict[str, float]:
+    """Median ns per call and case/calibration ratio, with the ratio's spread (IQR / median)."""
+    relative = median(samples["ratios"])
+    q1, _, q3 = quantiles(samples["ratios"], n=4)
+    return {
+        "ns": round(median(samples["seconds"]) * 1e9, 1),
+        "relative": round(relative, 5),
+        "spread": round((q3 - q1) / relative, 4),
+    }
+
+
+def _sample_in_worker(names: List[str], rounds: int) -> Dict[str, Dict[str, List[float]]]:
+    command = [sys.executable, "-m", "benchmarks.micro", "--worker", "--rounds", str(rounds)]
+    command += [f"--only={name}" for name in names]
+    completed = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout)
+
+
+def run(names: List[str], rounds: int, processes: int) -> Dict[str, Any]:
+    """Sample ``names`` in ``processes`` fresh interpreters, one after another, and pool them.
+
+    Timings shift between processes (memory layout, hash seeds) by more than they vary within
+    one, so a single process can sit well off the typical value for its whole run.
+    """
+    pooled: Dict[str, Dict[str, List[float]]] = {
+        name: {"seconds": [], "ratios": []} for name in names
+    }
+    for _ in range(processes):
+        for name, samples in _sample_in_worker(names, rounds).items():
+            for series, values in samples.items():
+                pooled[name][series].extend(values)
+    return {
+        "rounds": rounds,
+        "processes": processes,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": {name: summarise(samples) for name, samples in pooled.items()},
+    }
+
+
+def _change(case: Dict[str, Any], before: Dict[str, Any]) -> float:
+    return case["relative"] / before["relative"] - 1
+
+
+def over_threshold(
+    cases: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Any]], threshold: float
+) -> List[str]:
+    previous = (baseline or {}).get("cases", {})
+    return [
+        name
+        for name, case in cases.items()
+        if name in previous and _change(case, previous[name]) > threshold
+    ]
+
+
+def confirm(
+    suspects: List[str],
+    baseline: Optional[Dict[str, Any]],
+    threshold: float,
+    rounds: int,
+    processes: int,
+) -> List[str]:
+    """Re-measure ``suspects`` from scratch and keep those still over ``threshold`` each time."""
+    for _ in range(CONFIRM_RUNS):
+        if not suspects:
+            break
+        suspects = over_threshold(run(suspects, rounds, processes)["cases"], baseline, threshold)
+    return suspects
+
+
+def compare(
+    result: Dict[str, Any], baseline: Optional[Dict[str, Any]], flagged: List[str], label: str
+) -> None:
+    """Print a comparison table, marking the ``flagged`` cases with ``label``."""
+    print(f"{'case':<24} {'ns/call':>12} {'baseline':>12} {'change':>8} {'spread':>7}")
+    for name, case in result["cases"].items():
+        before = (baseline or {}).get("cases", {}).get(name)
+        spread = f"{case['spread']:>6.1%}"
+        if before is None:
+            print(f"{name:<24} {case['ns']:>12.1f} {'-':>12} {'-':>8} {spread}")
+            continue
+        flag = f"  {label}" if name in flagged else ""
+        print(
+            f"{name:<24} {case['ns']:>12.1f} {before['ns']:>12.1f} "
+            f"{_change(case, before):>+7.1%} {spread}{flag}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 on regressions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown against the baseline, as a fraction",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=DEFAULT_ROUNDS,
+        help="paired timing rounds per case and process",
+    )
+    parser.add_argument("--processes", type=int, default=DEFAULT_PROCESSES)
+    parser.add_argument("--only", action="append", choices=sorted(CASES), help="repeatable")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    names = args.only or list(CASES)
+
+    if args.worker:
+        print(json.dumps({name: sample(CASES[name](), args.rounds) for name in names}))
+        return 0
+
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    result = run(names, args.rounds, args.processes)
+    slower = over_threshold(result["cases"], baseline, args.threshold)
+    if args.check:
+        regressions = confirm(slower, baseline, args.threshold, args.rounds, args.processes)
+        compare(result, baseline, regressions, "REGRESSION")
+        unconfirmed = sorted(set(slower) - set(regressions))
+        if unconfirmed:
+            print(f"not confirmed on re-measurement: {', '.join(unconfirmed)}")
+    else:
+        regressions = []
+        compare(result, baseline, slower, "slower")
+
+    if args.save:
+        if args.only and baseline is not None:
+            # Keep the cases that were not re-measured.
+            result["cases"] = {**baseline.get("cases", {}), **result["cases"]}
+        args.baseline.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+    if args.check and regressions:
+        print(f"slower than baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
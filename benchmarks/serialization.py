@@ -0,0 +1,83 @@
+"""Measure per-request CPU spent turning a validated 100-item TaskList into response bytes.
+
+``response_model`` is FastAPI's default path: validate the returned model again against the
+declared field, run it through the encoder, then render with ``JSONResponse``.
+``orjson_default`` is the same pass rendered by ``ORJSONResponse``; ``model_response`` is what
+the routers now do.
+
+Run from the repository root: ``python -m benchmarks.serialization [--items 100]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable, Dict
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import ModelResponse
+from app.models.tasks import TaskList
+from benchmarks.fixtures import task_page
+
+FIELD = create_response_field(name="Response_list_tasks", type_=TaskList)
+
+
+async def run(render: Callable[[TaskList], Awaitable[bytes]], page: TaskList, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await render(page)
+    return (time.perf_counter() - started) / rounds
+
+
+async def response_model(page: TaskList) -> bytes:
+    content = await serialize_response(field=FIELD, response_content=page)
+    return JSONResponse(content).body
+
+
+async def orjson_default(page: TaskList) -> bytes:
+    content = await serialize_response(field=FIELD, response_content=page)
+    return ORJSONResponse(content).body
+
+
+async def model_response(page: TaskList) -> bytes:
+    return ModelResponse(page).body
+
+
+RENDERERS: Dict[str, Callable[[TaskList], Awaitable[bytes]]] = {
+    "response_model": response_model,
+    "orjson_default": orjson_default,
+    "model_response": model_response,
+}
+
+
+async def main_async(items: int, rounds: int) -> None:
+    page = task_page(items)
+    bodies = {name: await render(page) for name, render in RENDERERS.items()}
+    if len(set(bodies.values())) != 1:
+        raise SystemExit("renderers disagree on the response body")
+    baseline = None
+    print(f"{'path':<16} {'bytes':>8} {'us/request':>11} {'speedup':>8}")
+    for name, render in RENDERERS.items():
+        elapsed = await run(render, page, rounds)
+        baseline = baseline or elapsed
+        print(
+            f"{name:<16} {len(bodies[name]):>8} {elapsed * 1e6:>11.1f} {baseline / elapsed:>7.2f}x"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main_async(args.items, args.rounds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""A stand-in for Supabase's PostgREST and GoTrue endpoints, for load tests.
+
+It speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) to serve the requests
+``SupabaseClient`` makes, with configurable latency and list sizes. Responses are built
+from ``benchmarks.fixtures`` rows and cached as bytes, so the stub stays cheap next to the
+app under test.
+
+Run from the repository root: ``python -m benchmarks.stub_upstream [--port 0]``. It prints
+``listening on <port>`` once ready.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks.fixtures import client_row, task_row
+
+ROW_FACTORIES = {"tasks": task_row, "clients": client_row}
+USER = {"id": "bench-user", "email": "bench@example.com", "role": "authenticated"}
+SESSION = {
+    "access_token": "bench-access-token",
+    "refresh_token": "bench-refresh-token",
+    "token_type": "bearer",
+    "expires_in": 3600,
+    "user": USER,
+}
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 404: "Not Found"}
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+class StubOptions:
+    def __init__(
+        self,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 5.0,
+        slow_ratio: float = 0.0,
+        slow_ms: float = 1000.0,
+        rows: int = 20,
+        total: int = 500,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.slow_ratio = slow_ratio
+        self.slow_ms = slow_ms
+        self.rows = rows
+        self.total = total
+
+    def delay(self) -> float:
+        if self.slow_ratio and random.random() < self.slow_ratio:
+            return self.slow_ms / 1000
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+
+@lru_cache(maxsize=64)
+def _rows_body(table: str, count: int) -> bytes:
+    factory = ROW_FACTORIES.get(table, task_row)
+    return json.dumps([factory(index) for index in range(count)]).encode()
+
+
+def _json(status: int, payload: object, headers: Optional[Dict[str, str]] = None) -> Response:
+    return (
+        status,
+        {"Content-Type": "application/json", **(headers or {})},
+        json.dumps(payload).encode(),
+    )
+
+
+def _requested_rows(headers: Dict[str, str], params: Dict[str, str], default: int) -> int:
+    if "limit" in params:
+        return min(default, int(params["limit"]))
+    range_header = headers.get("range")
+    if range_header and "-" in range_header:
+        start, _, end = range_header.partition("-")
+        return min(default, int(end) - int(start) + 1)
+    return default
+
+
+def handle(
+    options: StubOptions, method: str, target: str, headers: Dict[str, str], body: bytes
+) -> Response:
+    url = urlsplit(target)
+    params = dict(parse_qsl(url.query))
+    path = url.path
+
+    if path.startswith("/auth/v1/"):
+        if path == "/auth/v1/user":
+            return _json(200, USER)
+        if path == "/auth/v1/token":
+            return _json(200, SESSION)
+        if path == "/auth/v1/.well-known/jwks.json":
+            return _json(200, {"keys": []})
+        if path == "/auth/v1/logout":
+            return 204, {}, b""
+        return _json(404, {"message": "not found"})
+
+    if not path.startswith("/rest/v1/"):
+        return _json(404, {"message": "not found"})
+    if path == "/rest/v1/rpc/pending_payment_amount":
+        return _json(200, 12500.5)
+    table = path[len("/rest/v1/") :].rpartition("/")[2]
+    factory = ROW_FACTORIES.get(table, task_row)
+    row_id = params.get("id", "")[3:] if params.get("id", "").startswith("eq.") else None
+
+    if method == "HEAD":
+        return 200, {"Content-Range": f"*/{options.total}"}, b""
+    if method == "DELETE":
+        return 204, {}, b""
+    if method in ("POST", "PATCH", "PUT"):
+        try:
+            sent = json.loads(body or b"{}")
+        except ValueError:
+            sent = {}
+        sent_rows = sent if isinstance(sent, list) else [sent]
+        rows = []
+        for index, values in enumerate(sent_rows):
+            row = factory(index)
+            row.update({k: v for k, v in values.items() if k in row and v is not None})
+            if row_id:
+                row["id"] = row_id
+            rows.append(row)
+        return _json(201 if method == "POST" else 200, rows)
+
+    if row_id is not None:
+        row = factory(0)
+        row["id"] = row_id
+        return _json(200, [row], {"Content-Range": "0-0/1"})
+    count = _requested_rows(headers, params, options.rows)
+    content_range = f"0-{count - 1}/{options.total}" if count else f"*/{options.total}"
+    return (
+        200,
+        {"Content-Type": "application/json", "Content-Range": content_range},
+        _rows_body(table, count),
+    )
+
+
+async def _serve_connection(
+    options: StubOptions, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", "0") or 0)
+            body = await reader.readexactly(length) if length else b""
+
+            await asyncio.sleep(options.delay())
+            status, response_headers, payload = handle(options, method, target, headers, body)
+            lines: List[str] = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}"]
+            response_headers = {**response_headers, "Content-Length": str(len(payload))}
+            lines.extend(f"{name}: {value}" for name, value in response_headers.items())
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                writer.write(payload)
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start(options: StubOptions, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+    return await asyncio.start_server(
+        lambda reader, writer: _serve_connection(options, reader, writer), host, port
+    )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    options = StubOptions(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        slow_ratio=args.slow_ratio,
+        slow_ms=args.slow_ms,
+        rows=args.rows,
+        total=args.total,
+    )
+    server = await start(options, args.host, args.port)
+    port = server.sockets[0].getsockname()[1]
+    print(f"listening on {port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--slow-ratio", type=float, default=0.0, help="fraction of replies delayed by --slow-ms"
+    )
+    parser.add_argument("--slow-ms", type=float, default=1000.0)
+    parser.add_argument("--rows", type=int, default=20, help="maximum rows per list reply")
+    parser.add_argument("--total", type=int, default=500, help="row count reported to clients")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    add_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Compare the upstream validation modes on a page of client rows as PostgREST returns them.
+
+Each round starts from the raw response bytes, so the ``per_row`` and ``list`` modes include
+the ``json.loads`` they depend on. ``model_construct`` is listed for reference only: it still needs
+the decoded rows, so it trails the ``json`` mode, and it leaves nested documents and tax
+profiles as plain dicts that then serialize without their camelCase aliases.
+
+Run from the repository root: ``python -m benchmarks.validation [--items 100]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict
+
+from httpx import Headers
+
+from app.db.supabase_client import SupabaseResponse
+from app.models.clients import Client
+from app.services.validation import validate_rows
+from benchmarks.fixtures import client_rows
+
+
+def construct(response: SupabaseResponse) -> list:
+    return [Client.model_construct(**row) for row in response.data]
+
+
+CANDIDATES: Dict[str, Callable[[SupabaseResponse], list]] = {
+    "per_row": lambda response: validate_rows(response, Client, "per_row"),
+    "list": lambda response: validate_rows(response, Client, "list"),
+    "json": lambda response: validate_rows(response, Client, "json"),
+    "model_construct": construct,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    content = json.dumps(client_rows(args.items)).encode()
+    baseline = None
+    print(f"{'mode':<16} {'us/page':>9} {'speedup':>8}")
+    for name, candidate in CANDIDATES.items():
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            candidate(SupabaseResponse(headers=Headers(), content=content))
+        elapsed = (time.perf_counter() - started) / args.rounds
+        baseline = baseline or elapsed
+        print(f"{name:<16} {elapsed * 1e6:>9.1f} {baseline / elapsed:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+create extension if not exists "pg_trgm";
+
+-- Clients: a stored tsvector that PostgREST can filter with fts/wfts and the index can serve.
+-- The expression index from 001 only matches queries that repeat its exact expression.
+alter table public.clients
+  add column search_tsv tsvector
+  generated always as (to_tsvector('spanish', name_or_business || ' ' || coalesce(notes, ''))) stored;
+
+drop index if exists public.clients_search_idx;
+create index clients_search_tsv_idx on public.clients using gin (search_tsv);
+
+-- Ranked search; security invoker keeps the clients RLS policies in force.
+create or replace function public.search_clients(q text)
+returns setof public.clients
+language sql
+stable
+security invoker
+as $$
+  select c.*
+  from public.clients c, websearch_to_tsquery('spanish', q) query
+  where c.search_tsv @@ query
+  order by ts_rank(c.search_tsv, query) desc, c.name_or_business, c.id;
+$$;
+
+grant execute on function public.search_clients(text) to authenticated;
+
+-- Tasks: trigram indexes so ilike '%q%' on title/description stops scanning.
+create index tasks_title_trgm_idx on public.tasks using gin (title gin_trgm_ops);
+create index tasks_description_trgm_idx on public.tasks using gin (description gin_trgm_ops);
@@ -0,0 +1,32 @@
+-- Respaces the caller's task order keys, keeping the current sequence (ties broken by id).
+-- Only "order" is written, so edits to other columns made meanwhile are kept, and no rows
+-- travel through PostgREST, so its max_rows cap cannot cut the rebalance short.
+create or replace function public.rebalance_task_orders(step double precision default 1024)
+returns integer
+language plpgsql
+volatile
+security invoker
+as $$
+declare
+  changed integer;
+begin
+  -- Lock first: moves committed while waiting are then ranked at their new position.
+  perform 1 from public.tasks where user_id = auth.uid() for update;
+
+  with ranked as (
+    select id, row_number() over (order by "order", id) * step as new_order
+    from public.tasks
+    where user_id = auth.uid()
+  )
+  update public.tasks t
+  set "order" = ranked.new_order
+  from ranked
+  where t.id = ranked.id
+    and t."order" is distinct from ranked.new_order;
+
+  get diagnostics changed = row_count;
+  return changed;
+end;
+$$;
+
+grant execute on function public.rebalance_task_orders(double precision) to authenticated;
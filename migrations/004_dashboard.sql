@@ -0,0 +1,14 @@
+-- Pending payment total for the dashboard, summed in the database instead of shipping every
+-- pending client row to the API. Security invoker keeps the clients RLS policies in force.
+create or replace function public.pending_payment_amount()
+returns numeric
+language sql
+stable
+security invoker
+as $$
+  select coalesce(sum(payment_amount), 0)
+  from public.clients
+  where payment_state = 'pendiente';
+$$;
+
+grant execute on function public.pending_payment_amount() to authenticated;
@@ -0,0 +1,22 @@
+-- Applies a batch of per-task partial updates in one statement. Each element of changes is
+-- {"id": ..., <column>: <value>, ...} and only the keys present are changed: the rest keep the
+-- values of the row being updated, not of a copy read earlier, so concurrent edits survive.
+-- updated_at is left to the set_tasks_updated_at trigger.
+create or replace function public.update_tasks(changes jsonb)
+returns setof public.tasks
+language sql
+volatile
+security invoker
+as $$
+  update public.tasks t
+  set (title, description, status, labels, due_date, add_to_calendar, "order", created_at) = (
+    select r.title, r.description, r.status, r.labels, r.due_date, r.add_to_calendar,
+           r."order", r.created_at
+    from jsonb_populate_record(t, c.change) r
+  )
+  from jsonb_array_elements(changes) as c(change)
+  where t.id = (c.change ->> 'id')::uuid
+  returning t.*;
+$$;
+
+grant execute on function public.update_tasks(jsonb) to authenticated;
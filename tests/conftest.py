@@ -19,6 +19,8 @@ class FakeSupabaseClient:
         self.refresh_payload = self.sign_in_payload
         self.user_payload = {"id": "user-1", "email": "user@example.com"}
         self.rest_mapping = {}
+        self.stream_pages = {}
+        self.calls = []
 
     async def auth_sign_in(self, email: str, password: str):
         return self.sign_in_payload
@@ -33,27 +35,50 @@ class FakeSupabaseClient:
         return None
 
     async def rest_request(self, method, path, access_token, params=None, json=None, headers=None):
+        self.calls.append((method, path, params, json, headers))
         key = (method, path)
         response = self.rest_mapping.get(key)
         if response is None:
             return SupabaseResponse(data=[], headers=Headers({"content-range": "0-0/0"}))
         return response
 
+    async def rest_stream(self, path, access_token, params=None, headers=None):
+        self.calls.append(("STREAM", path, params, None, headers))
+        pages = self.stream_pages.get(path) or [b"[]"]
+        body = pages.pop(0)
+
+        async def _chunks():
+            # Small chunks so rows straddle chunk boundaries.
+            for start in range(0, len(body), 7):
+                yield body[start : start + 7]
+
+        return _chunks()
+
+
+@pytest.fixture
+def make_app():
+    def _make(**overrides):
+        options = dict(
+            supabase_url="https://example.supabase.co",
+            supabase_anon_key="anon",
+            allowed_origins=["http://localhost"],
+        )
+        options.update(overrides)
+        application = create_app(settings=Settings(**options))
+        fake_client = FakeSupabaseClient()
+
+        async def _override():
+            return fake_client
+
+        application.dependency_overrides[get_supabase_client] = _override
+        return application, fake_client
+
+    return _make
+
 
 @pytest_asyncio.fixture
-async def app(monkeypatch):
-    settings = Settings(
-        supabase_url="https://example.supabase.co",
-        supabase_anon_key="anon",
-        allowed_origins=["http://localhost"],
-    )
-    application = create_app(settings=settings)
-    fake_client = FakeSupabaseClient()
-
-    async def _override():
-        return fake_client
-
-    application.dependency_overrides[get_supabase_client] = _override
+async def app(make_app):
+    application, fake_client = make_app()
 
     async with AsyncClient(app=application, base_url="http://test") as client:
         yield client, fake_client
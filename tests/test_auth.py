@@ -1,4 +1,13 @@
+import json
+import time
+
+import jwt
 import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+from httpx import AsyncClient
+
+from app.core.config import Settings
+from app.core.tokens import TokenVerifier
 
 
 @pytest.mark.asyncio
@@ -21,3 +30,86 @@ async def test_me_requires_cookie(app):
     assert response.status_code == 200
     payload = response.json()
     assert payload["user"]["email"] == "user@example.com"
+
+
+SECRET = "local-verification-test-secret-0123456789"
+
+
+def _token(secret=SECRET, **overrides):
+    claims = {
+        "sub": "user-2",
+        "email": "local@example.com",
+        "role": "authenticated",
+        "aud": "authenticated",
+        "exp": int(time.time()) + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+@pytest.mark.asyncio
+async def test_me_uses_local_claims_without_upstream_call(make_app):
+    application, fake = make_app(jwt_local_verification=True, jwt_secret=SECRET)
+
+    async def _fail(access_token):
+        raise AssertionError("auth_get_user should not be called")
+
+    fake.auth_get_user = _fail
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", _token())
+        response = await client.get("/auth/me")
+
+    assert response.status_code == 200
+    assert response.json()["user"] == {
+        "id": "user-2",
+        "email": "local@example.com",
+        "role": "authenticated",
+        "lastSignInAt": None,
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token",
+    [
+        _token(exp=int(time.time()) - 60),
+        _token(aud="anon"),
+        _token(secret="another-secret-that-is-long-enough-0123"),
+        "not-a-jwt",
+    ],
+    ids=["expired", "wrong-audience", "bad-signature", "malformed"],
+)
+async def test_invalid_token_rejected_before_upstream(make_app, token):
+    application, fake = make_app(jwt_local_verification=True, jwt_secret=SECRET)
+
+    async def _fail(*args, **kwargs):
+        raise AssertionError("rest_request should not be called")
+
+    fake.rest_request = _fail
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", token)
+        response = await client.get("/tasks")
+
+    assert response.status_code == 401
+    assert response.json()["code"] == "unauthorized"
+
+
+@pytest.mark.asyncio
+async def test_verifier_caches_jwks_keys():
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = json.loads(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "key-1", "alg": "ES256"})
+    calls = []
+
+    async def fetch_jwks():
+        calls.append(1)
+        return {"keys": [jwk]}
+
+    settings = Settings(supabase_url="https://example.supabase.co", supabase_anon_key="anon")
+    verifier = TokenVerifier(settings, fetch_jwks=fetch_jwks)
+    claims = {"sub": "user-3", "aud": "authenticated", "exp": int(time.time()) + 60}
+    token = jwt.encode(claims, private_key, algorithm="ES256", headers={"kid": "key-1"})
+
+    assert (await verifier.verify(token))["sub"] == "user-3"
+    assert (await verifier.verify(token))["sub"] == "user-3"
+    assert len(calls) == 1
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient, Headers
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.db.supabase_client import SupabaseResponse
+from app.models.batch import BatchRequest
+from app.services.batch_service import BatchService
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatches_sub_requests_with_shared_cookie(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "clients")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/0"})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post(
+            "/batch",
+            json={
+                "requests": [
+                    {"id": "me", "path": "/auth/me"},
+                    {"id": "tasks", "path": "/tasks?page=1&page_size=5"},
+                    {"id": "clients", "method": "GET", "path": "/clients"},
+                    {"id": "missing", "path": "/nope"},
+                ]
+            },
+        )
+
+    assert response.status_code == 200
+    results = {item["id"]: item for item in response.json()["responses"]}
+    assert results["me"]["status"] == 200
+    assert results["me"]["body"]["user"]["id"] == "user-1"
+    assert results["tasks"]["body"]["page_size"] == 5
+    assert results["clients"]["body"]["items"] == []
+    assert results["missing"]["status"] == 404
+    assert "content-encoding" not in results["tasks"]["headers"]
+
+
+@pytest.mark.asyncio
+async def test_batch_without_cookie_returns_sub_request_errors(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        response = await client.post("/batch", json={"requests": [{"path": "/tasks"}]})
+
+    (result,) = response.json()["responses"]
+    assert result["status"] == 401
+    assert result["body"]["code"] == "unauthorized"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "requests",
+    [
+        [{"path": "/batch"}],
+        [{"path": "/%62atch"}],
+        [{"path": "/tasks/../batch?x=1"}],
+        [{"method": "POST", "path": "/auth/signin"}],
+        [{"method": "POST", "path": "/auth/refresh/"}],
+        [{"method": "POST", "path": "/auth/./signout"}],
+        [{"path": "https://evil.example/x"}],
+        [],
+        [{"path": "/tasks"}] * 21,
+    ],
+)
+async def test_batch_rejects_invalid_requests(make_app, requests):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        response = await client.post("/batch", json={"requests": requests})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_refuses_sub_requests(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        response = await client.post(
+            "/batch",
+            json={"requests": [{"path": "/tasks"}]},
+            headers={"x-batch-sub-request": "1"},
+        )
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "invalid_batch"
+
+
+@pytest.mark.asyncio
+async def test_batch_caps_concurrent_sub_requests():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def slow(request):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        return JSONResponse({"cookie": request.headers.get("cookie")})
+
+    inner = Starlette(routes=[Route("/slow", slow)])
+    service = BatchService(inner, cookie="a=b", client=None, max_concurrency=2)
+
+    result = await service.run(BatchRequest(requests=[{"path": "/slow"}] * 6))
+
+    assert state["peak"] == 2
+    assert [response.body for response in result.responses] == [{"cookie": "a=b"}] * 6
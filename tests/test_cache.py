@@ -0,0 +1,104 @@
+import time
+
+import jwt
+import pytest
+from httpx import AsyncClient, Headers
+
+from app.core.cache import ReadCache
+from app.db.supabase_client import SupabaseResponse
+
+
+def test_read_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    cache = ReadCache(ttl=10, max_entries=10)
+
+    cache.set("user", "key", "value")
+    assert cache.get("user", "key") == "value"
+    now[0] += 11
+    assert cache.get("user", "key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_read_cache_evicts_least_recently_used():
+    cache = ReadCache(ttl=60, max_entries=2)
+    cache.set("user", "a", 1)
+    cache.set("user", "b", 2)
+    cache.get("user", "a")
+    cache.set("user", "c", 3)
+
+    assert cache.get("user", "b") is None
+    assert cache.get("user", "a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_read_cache_invalidates_only_scope():
+    cache = ReadCache(ttl=60, max_entries=10)
+    cache.set("user-1", "a", 1)
+    cache.set("user-2", "a", 2)
+
+    cache.invalidate("user-1")
+
+    assert cache.get("user-1", "a") is None
+    assert cache.get("user-2", "a") == 2
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_served_from_cache_until_write(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/0"})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        assert (await client.get("/tasks")).status_code == 200
+        assert (await client.get("/tasks")).status_code == 200
+        assert (await client.get("/tasks", params={"page": 2})).status_code == 200
+        assert (await client.delete("/tasks/t1")).status_code == 204
+        assert (await client.get("/tasks")).status_code == 200
+        stats = (await client.get("/stats")).json()["read_cache"]
+
+    reads = [call for call in fake.calls if call[0] == "GET"]
+    assert len(reads) == 3
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_write_from_one_session_invalidates_the_users_other_sessions(make_app):
+    secret = "cache-test-secret-0123456789abcdef0123"
+    application, fake = make_app(jwt_local_verification=True, jwt_secret=secret)
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/0"})
+    )
+
+    def token(session):
+        claims = {
+            "sub": "user-1",
+            "session_id": session,
+            "aud": "authenticated",
+            "exp": int(time.time()) + 3600,
+        }
+        return {"sb-access-token": jwt.encode(claims, secret, algorithm="HS256")}
+
+    laptop, phone = token("laptop"), token("phone")
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        assert (await client.get("/tasks", cookies=laptop)).status_code == 200
+        assert (await client.delete("/tasks/t1", cookies=phone)).status_code == 204
+        assert (await client.get("/tasks", cookies=laptop)).status_code == 200
+
+    reads = [call for call in fake.calls if call[0] == "GET"]
+    assert len(reads) == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_require_authentication(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        anonymous = await client.get("/stats")
+        client.cookies.set("sb-access-token", "token")
+        authenticated = await client.get("/stats")
+
+    assert anonymous.status_code == 401
+    assert authenticated.status_code == 200
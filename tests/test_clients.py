@@ -1,5 +1,5 @@
 import pytest
-from httpx import Headers
+from httpx import AsyncClient, Headers
 
 from app.db.supabase_client import SupabaseResponse
 
@@ -63,3 +63,47 @@ async def test_create_client(app):
     )
     assert response.status_code == 201
     assert response.json()["id"] == "c1"
+
+
+@pytest.mark.asyncio
+async def test_list_clients_sparse_fields(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "clients")] = SupabaseResponse(
+        data=[{"id": "c1", "name_or_business": "Cliente 1", "payment_state": "pagado"}],
+        headers=Headers({"content-range": "0-0/1"}),
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/clients", params={"fields": "nameOrBusiness,payment_state"})
+        invalid = await client.get("/clients", params={"fields": "documents,secret"})
+
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        {"id": "c1", "nameOrBusiness": "Cliente 1", "paymentState": "pagado"}
+    ]
+    assert fake.calls[0][2]["select"] == "id,name_or_business,payment_state"
+    assert invalid.status_code == 400
+    assert invalid.json()["code"] == "invalid_fields"
+
+
+@pytest.mark.asyncio
+async def test_client_search_uses_ranked_function_and_fts_filter(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "rpc/search_clients")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/0"})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        ranked = await client.get("/clients", params={"q": " declaración renta "})
+        keyset = await client.get("/clients", params={"q": "renta", "cursor": ""})
+
+    assert ranked.status_code == keyset.status_code == 200
+    (rpc_call, table_call) = fake.calls
+    assert rpc_call[1] == "rpc/search_clients"
+    assert rpc_call[2]["q"] == "declaración renta"
+    assert "order" not in rpc_call[2] and "search_tsv" not in rpc_call[2]
+    assert "search_tsv" not in rpc_call[2]["select"].split(",")
+    assert "*" not in rpc_call[2]["select"]
+    assert table_call[1] == "clients"
+    assert table_call[2]["search_tsv"] == "wfts(spanish).renta"
+    assert table_call[2]["order"] == "name_or_business.asc,id.asc"
@@ -0,0 +1,64 @@
+import pytest
+from httpx import AsyncClient, Headers
+
+from app.core.compression import negotiate_encoding
+from app.db.supabase_client import SupabaseResponse
+
+
+def _tasks(count):
+    return [
+        {
+            "id": f"task-{index}",
+            "title": f"Task {index}",
+            "status": "sin_iniciar",
+            "order": index,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z",
+        }
+        for index in range(count)
+    ]
+
+
+def test_negotiate_encoding_respects_q_values_and_preference():
+    preference = ["br", "zstd", "gzip"]
+    assert negotiate_encoding("gzip, deflate, br", preference) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", preference) == "gzip"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", preference) == "br"
+    assert negotiate_encoding("identity", preference) is None
+    assert negotiate_encoding("", preference) is None
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped_and_etag_weakened(make_app):
+    application, fake = make_app(compression_encodings=["gzip"])
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=_tasks(50), headers=Headers({"content-range": "0-49/50"})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        plain = await client.get("/tasks", headers={"Accept-Encoding": "identity"})
+        compressed = await client.get("/tasks", headers={"Accept-Encoding": "gzip"})
+        revalidated = await client.get(
+            "/tasks",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]},
+        )
+
+    assert "content-encoding" not in plain.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.num_bytes_downloaded < len(plain.content)
+    assert compressed.content == plain.content
+    assert compressed.headers["etag"] == f"W/{plain.headers['etag']}"
+    assert revalidated.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_small_responses_are_sent_uncompressed(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/tasks", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.json()["items"] == []
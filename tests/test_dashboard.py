@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient, Headers
+
+from app.core.config import Settings, get_settings
+from app.db.supabase_client import SupabaseResponse
+
+COUNTS = {
+    ("tasks", "status", "eq.sin_iniciar"): 4,
+    ("tasks", "status", "eq.en_proceso"): 2,
+    ("tasks", "status", "eq.finalizado"): 7,
+    ("tasks", "status", "neq.finalizado"): 3,
+    ("clients", "payment_state", "eq.pendiente"): 5,
+    ("clients", "payment_state", "eq.pagado"): 9,
+}
+
+
+def _fake_upstream(fake, rows):
+    in_flight = 0
+    fake.max_in_flight = 0
+
+    async def rest_request(method, path, access_token, params=None, json=None, headers=None):
+        nonlocal in_flight
+        fake.calls.append((method, path, params, json, headers))
+        in_flight += 1
+        fake.max_in_flight = max(fake.max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if method == "HEAD":
+            key = next(k for k in COUNTS if params.get(k[1]) == k[2] and k[0] == path)
+            return SupabaseResponse(data={}, headers=Headers({"content-range": f"*/{COUNTS[key]}"}))
+        return SupabaseResponse(data=rows, headers=Headers())
+
+    fake.rest_request = rest_request
+
+
+@pytest.mark.asyncio
+async def test_dashboard_runs_queries_concurrently(make_app):
+    application, fake = make_app()
+    _fake_upstream(fake, 150.0)
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/dashboard")
+        cached = await client.get("/dashboard")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "tasksTotal": 13,
+        "tasksByStatus": {"sin_iniciar": 4, "en_proceso": 2, "finalizado": 7},
+        "overdueTasks": 3,
+        "clientsTotal": 14,
+        "clientsByPaymentState": {"pendiente": 5, "pagado": 9},
+        "pendingPaymentAmount": 150.0,
+    }
+    assert len(fake.calls) == 7
+    assert ("GET", "rpc/pending_payment_amount") in [call[:2] for call in fake.calls]
+    assert fake.max_in_flight == 7
+    assert cached.json() == response.json()
+
+
+@pytest.mark.asyncio
+async def test_dashboard_uses_postgrest_aggregate_when_enabled(make_app):
+    application, fake = make_app()
+    settings = Settings(
+        supabase_url="https://example.supabase.co",
+        supabase_anon_key="anon",
+        postgrest_aggregates=True,
+    )
+    application.dependency_overrides[get_settings] = lambda: settings
+    _fake_upstream(fake, [{"total": 1234.5}])
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/dashboard")
+
+    assert response.json()["pendingPaymentAmount"] == 1234.5
+    (get_call,) = [call for call in fake.calls if call[0] == "GET"]
+    assert get_call[2]["select"] == "total:payment_amount.sum()"
@@ -0,0 +1,70 @@
+import pytest
+from httpx import AsyncClient, Headers
+
+from app.core.etag import etag_matches
+from app.db.supabase_client import SupabaseResponse
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', 'W/"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_returns_not_modified(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/0"})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        first = await client.get("/tasks")
+        etag = first.headers["etag"]
+        second = await client.get("/tasks", headers={"If-None-Match": etag})
+        stale = await client.get("/tasks", headers={"If-None-Match": '"stale"'})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert stale.status_code == 200
+    assert stale.content == first.content
+
+
+@pytest.mark.asyncio
+async def test_cached_list_revalidates_without_running_the_endpoint(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/0"})
+    )
+    cache = application.state.read_cache
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        etag = (await client.get("/tasks")).headers["etag"]
+        remembered = await client.get("/tasks", headers={"If-None-Match": etag})
+        hits, calls = cache.hits, len(fake.calls)
+        client.cookies.set("sb-access-token", "other-token")
+        other_user = await client.get("/tasks", headers={"If-None-Match": etag})
+        client.cookies.set("sb-access-token", "token")
+        cache.clear()
+        after_write = await client.get("/tasks", headers={"If-None-Match": etag})
+
+    assert remembered.status_code == 304
+    assert remembered.headers["etag"] == etag
+    assert hits == 0
+    assert other_user.status_code == 304
+    assert len(fake.calls) == calls + 2
+    assert after_write.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_errors_and_writes_carry_no_etag(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        unauthorised = await client.get("/tasks")
+
+    assert unauthorised.status_code == 401
+    assert "etag" not in unauthorised.headers
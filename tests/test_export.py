@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.db.streaming import JsonArraySplitter
+
+
+def _client(index):
+    return {
+        "id": f"c{index}",
+        "name_or_business": f"Cliente, {index}",
+        "identificacion": f"900{index}",
+        "payment_state": "pagado",
+        "payment_amount": 10.5,
+        "tags": ["iva"],
+        "tax_profile": {"identificacion_tipo": "NIT"},
+    }
+
+
+def test_splitter_yields_rows_across_chunk_boundaries():
+    rows = [{"a": 'x,"]}\\'}, {"b": [1, {"c": '\\"'}]}, {}]
+    body = json.dumps(rows).encode()
+    splitter = JsonArraySplitter()
+
+    elements = [
+        element for index in range(len(body)) for element in splitter.feed(body[index : index + 1])
+    ]
+
+    assert [json.loads(element) for element in elements] == rows
+    assert JsonArraySplitter().feed(b"[ ]") == []
+
+
+@pytest.mark.asyncio
+async def test_export_clients_ndjson_walks_keyset_pages(make_app, monkeypatch):
+    monkeypatch.setattr("app.services.export.EXPORT_PAGE_SIZE", 2)
+    application, fake = make_app()
+    fake.stream_pages["clients"] = [
+        json.dumps([_client(1), _client(2)]).encode(),
+        json.dumps([_client(3)]).encode(),
+    ]
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/clients/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == ["c1", "c2", "c3"]
+    assert lines[0]["nameOrBusiness"] == "Cliente, 1"
+    assert lines[0]["taxProfile"]["identificacionTipo"] == "NIT"
+    first, second = [call[2] for call in fake.calls if call[0] == "STREAM"]
+    assert first["order"] == "name_or_business.asc,id.asc"
+    assert "and" not in first
+    assert (
+        second["and"]
+        == '(or(name_or_business.gt."Cliente, 2",and(name_or_business.eq."Cliente, 2",id.gt."c2")))'
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_clients_csv(make_app):
+    application, fake = make_app()
+    fake.stream_pages["clients"] = [json.dumps([_client(1)]).encode()]
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/clients/export", params={"format": "csv"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="clients.csv"'
+    header, row = list(csv.reader(io.StringIO(response.text)))
+    values = dict(zip(header, row))
+    assert values["nameOrBusiness"] == "Cliente, 1"
+    assert values["paymentAmount"] == "10.5"
+    assert json.loads(values["tags"]) == ["iva"]
+    assert values["contact"] == ""
@@ -0,0 +1,64 @@
+import httpx
+import pytest
+import respx
+from httpx import AsyncClient
+
+from app.core.config import Settings
+from app.core.metrics import Histogram, Metrics
+from app.db.supabase_client import SupabaseClient
+
+BASE_URL = "https://example.supabase.co"
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(("/tasks",), value)
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{route="/tasks",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/tasks",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/tasks",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/tasks"} 3' in lines
+    assert 'latency_seconds_sum{route="/tasks"} 5.55' in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_templates(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        await client.get("/tasks/task-1")
+        await client.get("/no-such-path")
+        response = await client.get("/metrics")
+
+    body = response.text
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'bff_http_request_duration_seconds_count{method="GET",route="/tasks/{task_id}",status="404"} 1'
+        in body
+    )
+    assert 'route="unmatched",status="404"' in body
+    assert "bff_http_requests_in_flight 1.0" in body
+    assert "bff_read_cache_hits" in body
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_upstream_requests_are_timed_per_operation_and_table():
+    respx.get(f"{BASE_URL}/rest/v1/tasks").mock(return_value=httpx.Response(200, json=[]))
+    metrics = Metrics()
+    client = SupabaseClient(
+        Settings(supabase_url=BASE_URL, supabase_anon_key="anon"), metrics=metrics
+    )
+
+    await client.rest_request("GET", "tasks", "token", params={"select": "*"})
+    await client.close()
+
+    rendered = metrics.render({"supabase": client.stats()})
+    assert (
+        'bff_upstream_request_duration_seconds_count{operation="rest_request",table="tasks",'
+        'method="GET",status="200"} 1' in rendered
+    )
+    assert "bff_supabase_pool_requests 1" in rendered
@@ -0,0 +1,17 @@
+import math
+
+from app.services.ordering import ORDER_STEP, needs_rebalance, order_between
+
+
+def test_order_between_neighbours():
+    assert order_between(1.0, 2.0) == 1.5
+    assert order_between(None, 2.0) == 2.0 - ORDER_STEP
+    assert order_between(1.0, None) == 1.0 + ORDER_STEP
+    assert order_between(2.0, 1.0) is None
+
+
+def test_order_between_detects_exhausted_precision():
+    adjacent = math.nextafter(1.0, 2.0)
+    assert order_between(1.0, adjacent) is None
+    assert needs_rebalance(1.0, 1.0 + 1e-12)
+    assert not needs_rebalance(1.0, 2.0)
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient, Headers
+
+from app.core.errors import AppError
+from app.db.supabase_client import SupabaseResponse
+from app.models.common import CountStrategy
+from app.services.pagination import decode_cursor, encode_cursor, keyset_condition, parse_total
+
+
+def test_cursor_round_trip_and_rejects_foreign_cursor():
+    cursor = encode_cursor("clients", ["Acme, Inc.", "c1"])
+
+    assert decode_cursor(cursor, "clients") == ["Acme, Inc.", "c1"]
+    with pytest.raises(AppError):
+        decode_cursor(cursor, "tasks")
+    with pytest.raises(AppError):
+        decode_cursor("not a cursor", "clients")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values", [["B"], ["B", "c2", "extra"], [["B"], "c2"], [{"order": 1}, "t1"], [None, "c2"]]
+)
+async def test_malformed_cursor_payloads_are_rejected(make_app, values):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/clients", params={"cursor": encode_cursor("clients", values)})
+
+    assert response.status_code == 400
+    assert response.json()["code"] == "invalid_cursor"
+
+
+def test_keyset_condition_quotes_reserved_characters():
+    assert keyset_condition("name_or_business", 'Acme, "Inc"', "c1") == (
+        'or(name_or_business.gt."Acme, \\"Inc\\"",'
+        'and(name_or_business.eq."Acme, \\"Inc\\"",id.gt."c1"))'
+    )
+    assert keyset_condition("order", 1.5, "t1") == 'or(order.gt.1.5,and(order.eq.1.5,id.gt."t1"))'
+
+
+def _client_row(client_id, name):
+    return {
+        "id": client_id,
+        "name_or_business": name,
+        "identificacion": "1",
+        "payment_state": "pendiente",
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_clients_cursor_mode(make_app):
+    application, fake = make_app(read_cache_ttl=0)
+    fake.rest_mapping[("GET", "clients")] = SupabaseResponse(
+        data=[_client_row("c1", "A"), _client_row("c2", "B"), _client_row("c3", "C")],
+        headers=Headers({"content-range": "0-2/10"}),
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        first = (await client.get("/clients", params={"cursor": "", "page_size": 2})).json()
+        await client.get("/clients", params={"cursor": first["next_cursor"], "page_size": 2})
+
+    assert [item["id"] for item in first["items"]] == ["c1", "c2"]
+    assert decode_cursor(first["next_cursor"], "clients") == ["B", "c2"]
+    first_params, second_params = fake.calls[0][2], fake.calls[1][2]
+    assert first_params["limit"] == "3"
+    assert "and" not in first_params
+    assert (
+        second_params["and"]
+        == '(or(name_or_business.gt."B",and(name_or_business.eq."B",id.gt."c2")))'
+    )
+    assert "Range" not in fake.calls[1][4]
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_keep_the_unseeked_total(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "clients")] = SupabaseResponse(
+        data=[_client_row("c1", "A"), _client_row("c2", "B"), _client_row("c3", "C")],
+        headers=Headers({"content-range": "0-2/10"}),
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        first = (await client.get("/clients", params={"cursor": "", "page_size": 2})).json()
+        fake.rest_mapping[("GET", "clients")] = SupabaseResponse(
+            data=[_client_row("c3", "C")], headers=Headers({"content-range": "0-0/*"})
+        )
+        second = (
+            await client.get("/clients", params={"cursor": first["next_cursor"], "page_size": 2})
+        ).json()
+
+    assert fake.calls[0][4]["Prefer"] == "count=exact"
+    assert "Prefer" not in fake.calls[1][4]
+    assert (first["total"], first["total_exact"]) == (10, True)
+    assert (second["total"], second["total_exact"]) == (10, True)
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_without_count_uses_background_total(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[], headers=Headers({"content-range": "*/*"})
+    )
+    fake.rest_mapping[("HEAD", "tasks")] = SupabaseResponse(
+        data={}, headers=Headers({"content-range": "0-0/1200"})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        first = (await client.get("/tasks", params={"count": "none"})).json()
+        await asyncio.sleep(0)
+        second = (await client.get("/tasks", params={"count": "none"})).json()
+
+    assert (first["total"], first["total_exact"]) == (0, False)
+    assert (second["total"], second["total_exact"]) == (1200, True)
+    assert "Prefer" not in fake.calls[0][4]
+    assert fake.calls[1][0] == "HEAD"
+    assert fake.calls[1][4]["Prefer"] == "count=exact"
+
+
+def test_parse_total_reports_exactness():
+    headers = Headers({"content-range": "0-19/1200"})
+
+    assert parse_total(headers, CountStrategy.exact) == (1200, True)
+    assert parse_total(headers, CountStrategy.planned) == (1200, False)
+    assert parse_total(Headers({"content-range": "0-19/*"}), CountStrategy.none) == (None, False)
@@ -0,0 +1,107 @@
+import time
+
+import jwt
+import pytest
+from fastapi import Request
+from httpx import AsyncClient
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+
+from app.core.errors import AppError
+from app.core.rate_limit import route_limit
+
+SECRET = "rate-limit-test-secret-0123456789abcdef"
+
+
+def _token(sub, **extra):
+    claims = {"sub": sub, "aud": "authenticated", "exp": int(time.time()) + 3600, **extra}
+    return jwt.encode(claims, SECRET, algorithm="HS256")
+
+
+@pytest.mark.asyncio
+async def test_route_limit_is_per_user_behind_one_address(make_app):
+    application, _ = make_app(
+        jwt_local_verification=True, jwt_secret=SECRET, rate_limit_list="2/minute"
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        alice = [
+            (await client.get("/tasks", cookies={"sb-access-token": _token("alice")})).status_code
+            for _ in range(3)
+        ]
+        bob = await client.get("/tasks", cookies={"sb-access-token": _token("bob")})
+        limited = await client.get("/tasks", cookies={"sb-access-token": _token("alice")})
+
+    assert alice == [200, 200, 429]
+    assert bob.status_code == 200
+    assert limited.json()["code"] == "rate_limited"
+    assert int(limited.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_route_limit_follows_the_session_across_refreshes(make_app):
+    application, _ = make_app(rate_limit_list="2/minute")
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        statuses = [
+            (
+                await client.get(
+                    "/tasks",
+                    cookies={"sb-access-token": _token("alice", session_id="s1", iat=i)},
+                )
+            ).status_code
+            for i in range(3)
+        ]
+
+    assert statuses == [200, 200, 429]
+
+
+@pytest.mark.asyncio
+async def test_search_limit_only_applies_to_queries(make_app):
+    application, _ = make_app(rate_limit_search="1/minute")
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        searches = [
+            (await client.get("/clients", params={"q": "acme"})).status_code for _ in range(2)
+        ]
+        plain = await client.get("/clients")
+
+    assert searches == [200, 429]
+    assert plain.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_per_address_ceiling_spans_all_keys(make_app):
+    application, _ = make_app(rate_limit_per_ip="2/minute")
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        statuses = [
+            (await client.get("/tasks", cookies={"sb-access-token": f"forged-{i}"})).status_code
+            for i in range(3)
+        ]
+        response = await client.get("/tasks", cookies={"sb-access-token": "forged-x"})
+
+    assert statuses == [200, 200, 429]
+    assert response.json()["code"] == "rate_limited"
+    assert "Retry-After" in response.headers
+
+
+class _DeadStorageLimiter:
+    def hit(self, *args):
+        raise ConnectionError("storage down")
+
+
+def test_route_limit_falls_back_to_memory_when_storage_fails(make_app):
+    application, _ = make_app(rate_limit_list="1/minute")
+    limiter = application.state.limiter
+    limiter._in_memory_fallback_enabled = True
+    limiter._fallback_limiter = FixedWindowRateLimiter(MemoryStorage())
+    limiter._limiter = _DeadStorageLimiter()
+    request = Request(
+        {"type": "http", "app": application, "headers": [], "client": ("10.0.0.1", 1)}
+    )
+    enforce = route_limit("list")
+
+    enforce(request)
+    with pytest.raises(AppError) as exc_info:
+        enforce(request)
+
+    assert exc_info.value.status_code == 429
+    assert limiter._storage_dead
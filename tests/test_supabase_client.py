@@ -0,0 +1,271 @@
+import asyncio
+
+import httpx
+import pytest
+import respx
+
+from app.core.config import Settings
+from app.core.errors import AppError
+from app.db.hedging import HedgePolicy
+from app.db.pool import PoolMonitor, build_limits, build_timeout
+from app.db.resilience import RetryPolicy, is_idempotent
+from app.db.supabase_client import SupabaseClient
+
+BASE_URL = "https://example.supabase.co"
+
+
+def _client(**overrides) -> SupabaseClient:
+    return SupabaseClient(Settings(supabase_url=BASE_URL, supabase_anon_key="anon", **overrides))
+
+
+def _delayed(response: httpx.Response, delay: float = 0.01):
+    async def _side_effect(request):
+        await asyncio.sleep(delay)
+        return response
+
+    return _side_effect
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_identical_concurrent_gets_share_one_upstream_call():
+    route = respx.get(f"{BASE_URL}/rest/v1/tasks").mock(
+        side_effect=_delayed(httpx.Response(200, json=[{"id": "t1"}]))
+    )
+    client = _client()
+
+    results = await asyncio.gather(
+        *[client.rest_request("GET", "tasks", "token", params={"select": "*"}) for _ in range(5)]
+    )
+    await client.rest_request("GET", "tasks", "other-token", params={"select": "*"})
+    await client.close()
+
+    assert route.call_count == 2
+    assert all(result.data == [{"id": "t1"}] for result in results)
+    assert client.stats()["coalescing"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_coalesced_errors_reach_every_waiter():
+    route = respx.get(f"{BASE_URL}/auth/v1/user").mock(
+        side_effect=_delayed(httpx.Response(401, json={"message": "bad token"}))
+    )
+    client = _client()
+
+    results = await asyncio.gather(
+        *[client.auth_get_user("token") for _ in range(3)], return_exceptions=True
+    )
+    await client.close()
+
+    assert route.call_count == 1
+    assert all(isinstance(result, AppError) for result in results)
+    assert {result.status_code for result in results} == {401}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_writes_are_never_coalesced():
+    route = respx.patch(f"{BASE_URL}/rest/v1/tasks").mock(
+        side_effect=_delayed(httpx.Response(200, json=[]))
+    )
+    client = _client()
+
+    await asyncio.gather(
+        *[client.rest_request("PATCH", "tasks?id=eq.t1", "token", json={}) for _ in range(3)]
+    )
+    await client.close()
+
+    assert route.call_count == 3
+
+
+def test_pool_settings_build_limits_and_timeouts():
+    settings = Settings(
+        supabase_url=BASE_URL,
+        supabase_anon_key="anon",
+        http_max_connections=7,
+        http_max_keepalive_connections=3,
+        request_timeout=4.0,
+        http_connect_timeout=1.5,
+    )
+
+    limits = build_limits(settings)
+    timeout = build_timeout(settings)
+
+    assert (limits.max_connections, limits.max_keepalive_connections) == (7, 3)
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (1.5, 4.0, 4.0, 4.0)
+
+
+@pytest.mark.asyncio
+async def test_pool_monitor_tracks_reuse_and_waits(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("app.db.pool.time.perf_counter", lambda: clock[0])
+    monitor = PoolMonitor(httpx.AsyncHTTPTransport(), httpx.Limits(max_connections=2))
+
+    trace = monitor.request_started()
+    await trace("connection.connect_tcp.started", {})
+    monitor.request_finished()
+    trace = monitor.request_started()
+    clock[0] += 0.25
+    await trace("http11.send_request_headers.started", {})
+    await trace("http11.send_request_headers.started", {})
+
+    stats = monitor.stats()
+    assert stats["in_flight"] == 1
+    assert stats["new_connections"] == 1
+    assert stats["reuse_ratio"] == 0.5
+    assert stats["pool_waits"] == 1
+    assert stats["max_pool_wait_seconds"] == 0.25
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_rest_stream_yields_body_and_raises_before_streaming_on_error():
+    respx.get(f"{BASE_URL}/rest/v1/clients").mock(
+        return_value=httpx.Response(200, content=b'[{"id": "c1"}]')
+    )
+    respx.get(f"{BASE_URL}/rest/v1/tasks").mock(
+        return_value=httpx.Response(401, json={"message": "JWT expired"})
+    )
+    client = _client()
+
+    chunks = await client.rest_stream("clients", "token", params={"select": "*"})
+    body = b"".join([chunk async for chunk in chunks])
+    with pytest.raises(AppError) as excinfo:
+        await client.rest_stream("tasks", "token")
+    await client.close()
+
+    assert body == b'[{"id": "c1"}]'
+    assert excinfo.value.status_code == 401
+    assert excinfo.value.detail == "JWT expired"
+    assert client.stats()["pool"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_idempotent_reads_retry_transient_failures():
+    route = respx.get(f"{BASE_URL}/rest/v1/tasks").mock(
+        side_effect=[
+            httpx.ConnectError("reset"),
+            httpx.Response(503, headers={"Retry-After": "0"}),
+            httpx.Response(200, json=[{"id": "t1"}]),
+        ]
+    )
+    client = _client(upstream_retry_backoff=0.001)
+
+    response = await client.rest_request("GET", "tasks", "token")
+    await client.close()
+
+    assert route.call_count == 3
+    assert response.data == [{"id": "t1"}]
+    assert client.stats()["resilience"]["retries"] == 2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_non_idempotent_writes_are_not_retried_and_transport_errors_map_to_app_error():
+    route = respx.post(f"{BASE_URL}/rest/v1/tasks").mock(side_effect=httpx.ReadTimeout("slow"))
+    client = _client(upstream_retry_backoff=0.001)
+
+    with pytest.raises(AppError) as excinfo:
+        await client.rest_request("POST", "tasks", "token", json=[{}])
+    await client.close()
+
+    assert route.call_count == 1
+    assert (excinfo.value.status_code, excinfo.value.code) == (504, "upstream_timeout")
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_open_circuit_fails_fast_and_serves_stale_reads():
+    route = respx.get(f"{BASE_URL}/rest/v1/tasks").mock(
+        side_effect=[httpx.Response(200, json=[{"id": "t1"}])] + [httpx.Response(502)] * 10
+    )
+    client = _client(upstream_retries=0, circuit_min_calls=2, circuit_reset_timeout=60)
+
+    fresh = await client.rest_request("GET", "tasks", "token")
+    stale = await client.rest_request("GET", "tasks", "token")
+    with pytest.raises(AppError) as excinfo:
+        await client.rest_request("GET", "tasks", "other-token")
+    await client.close()
+
+    assert route.call_count == 2
+    assert stale.data == fresh.data == [{"id": "t1"}]
+    assert (excinfo.value.status_code, excinfo.value.code) == (503, "upstream_unavailable")
+    assert excinfo.value.headers["Retry-After"] == "60"
+    assert client.stats()["resilience"]["circuit"]["state"] == "open"
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "params", "expected"),
+    [
+        ("GET", "tasks", None, True),
+        ("PATCH", "tasks?id=eq.t1", None, True),
+        ("PUT", "tasks", {"id": "eq.t1"}, True),
+        ("DELETE", "tasks?id=eq.t1", None, True),
+        ("PATCH", "tasks?id=in.(t1,t2)", None, False),
+        ("DELETE", "tasks?user_id=eq.u1", None, False),
+        ("POST", "tasks?id=eq.t1", None, False),
+    ],
+)
+def test_is_idempotent(method, url, params, expected):
+    assert is_idempotent(method, url, params) is expected
+
+
+def test_retry_policy_honours_retry_after_up_to_its_cap():
+    policy = RetryPolicy(retries=2, max_retry_after=5)
+
+    assert policy.delay(0, httpx.Response(503, headers={"Retry-After": "3"})) == 3
+    assert policy.delay(0, httpx.Response(503, headers={"Retry-After": "30"})) is None
+    assert policy.delay(0, httpx.Response(500)) is None
+    assert policy.delay(2, httpx.Response(503)) is None
+    assert 0 <= policy.delay(1) <= 0.2
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_slow_reads_are_hedged_and_the_faster_reply_wins():
+    replies = iter([0.0] * 20 + [0.5, 0.0])
+    sent = 0
+
+    async def _side_effect(request):
+        nonlocal sent
+        sent += 1
+        await asyncio.sleep(next(replies))
+        return httpx.Response(200, json=[{"id": "t1"}])
+
+    respx.get(f"{BASE_URL}/rest/v1/tasks").mock(side_effect=_side_effect)
+    client = _client(hedge_reads=True, hedge_budget=1.0, hedge_min_delay=0.01, coalesce_reads=False)
+
+    for _ in range(20):
+        await client.rest_request("GET", "tasks", "token")
+    started = asyncio.get_running_loop().time()
+    response = await client.rest_request("GET", "tasks", "token")
+    elapsed = asyncio.get_running_loop().time() - started
+    await client.close()
+
+    hedging = client.stats()["hedging"]
+    assert response.data == [{"id": "t1"}]
+    assert elapsed < 0.3
+    assert sent == 22
+    assert (hedging["hedged"], hedging["hedge_wins"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedge_budget_caps_extra_requests():
+    policy = HedgePolicy(budget=0.1, min_delay=0.001, min_samples=1)
+    policy.observe("GET tasks", 0.001)
+    calls = 0
+
+    async def _slow():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    for _ in range(20):
+        await policy.run("GET tasks", _slow)
+
+    assert policy.hedged == 2
+    assert calls == 22
+    assert policy.budget_denied == 18
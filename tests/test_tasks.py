@@ -1,5 +1,7 @@
+import math
+
 import pytest
-from httpx import Headers
+from httpx import AsyncClient, Headers
 
 from app.db.supabase_client import SupabaseResponse
 
@@ -54,3 +56,189 @@ async def test_complete_task(app):
     response = await client.post("/tasks/t1/complete")
     assert response.status_code == 200
     assert response.json()["status"] == "finalizado"
+
+
+def _task_row(task_id, **overrides):
+    row = {
+        "id": task_id,
+        "title": "Tarea",
+        "description": "",
+        "status": "sin_iniciar",
+        "labels": [],
+        "due_date": None,
+        "add_to_calendar": False,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "order": 1000.0,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.asyncio
+async def test_batch_reorder_is_one_update_call_with_only_changed_columns(make_app):
+    application, fake = make_app()
+    calls = []
+
+    async def rest_request(method, path, access_token, params=None, json=None, headers=None):
+        calls.append((method, path, params, json, headers))
+        if path == "rpc/update_tasks":
+            changes = [change for change in json["changes"] if change["id"] != "missing"]
+            rows = [_task_row(change["id"], **change) for change in changes]
+            return SupabaseResponse(data=rows, headers=Headers({}))
+        if method == "POST":
+            rows = [_task_row(f"new-{i}", **row) for i, row in enumerate(json)]
+            return SupabaseResponse(data=rows, headers=Headers({}))
+        return SupabaseResponse(data=None, headers=Headers({}))
+
+    fake.rest_request = rest_request
+    payload = {
+        "creates": [{"title": "A", "status": "sin_iniciar", "order": 1.0}],
+        "updates": [
+            {"id": "t1", "order": 3.0},
+            {"id": "t2", "order": 2.0},
+            {"id": "missing", "order": 1.5},
+            {"id": "t3", "order": 2.0},
+        ],
+        "deletes": ["t4", "t5"],
+    }
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post("/tasks/batch", json=payload)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(r["op"], r["id"], r["status"]) for r in results] == [
+        ("create", "new-0", 201),
+        ("update", "t1", 200),
+        ("update", "t2", 200),
+        ("update", "missing", 404),
+        ("update", "t3", 200),
+        ("delete", "t4", 204),
+        ("delete", "t5", 204),
+    ]
+    assert results[1]["task"]["order"] == 3.0
+    assert sorted((method, path) for method, path, *_ in calls) == [
+        ("DELETE", "tasks?id=in.(t4,t5)"),
+        ("POST", "rpc/update_tasks"),
+        ("POST", "tasks"),
+    ]
+    (update_call,) = [call for call in calls if call[1] == "rpc/update_tasks"]
+    assert update_call[3] == {
+        "changes": [
+            {"id": "t1", "order": 3.0},
+            {"id": "t2", "order": 2.0},
+            {"id": "missing", "order": 1.5},
+            {"id": "t3", "order": 2.0},
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_identical_updates_use_single_patch(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("PATCH", "tasks?id=in.(t1,t2)")] = SupabaseResponse(
+        data=[_task_row("t1", status="finalizado"), _task_row("t2", status="finalizado")],
+        headers=Headers({}),
+    )
+    payload = {
+        "updates": [{"id": "t1", "status": "finalizado"}, {"id": "t2", "status": "finalizado"}]
+    }
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post("/tasks/batch", json=payload)
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [200, 200]
+    assert [(method, path) for method, path, *_ in fake.calls] == [("PATCH", "tasks?id=in.(t1,t2)")]
+
+
+@pytest.mark.asyncio
+async def test_move_task_updates_single_row_with_midpoint(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[{"id": "a", "order": 1000.0}, {"id": "b", "order": 2000.0}], headers=Headers({})
+    )
+    fake.rest_mapping[("PATCH", "tasks?id=eq.t1")] = SupabaseResponse(
+        data=[_task_row("t1", order=1500.0)], headers=Headers({})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post("/tasks/t1/move", json={"beforeId": "a", "afterId": "b"})
+
+    assert response.status_code == 200
+    patches = [call for call in fake.calls if call[0] == "PATCH"]
+    assert len(patches) == 1
+    assert patches[0][3] == {"order": 1500.0}
+
+
+@pytest.mark.asyncio
+async def test_move_task_rebalances_when_keys_are_exhausted(make_app):
+    application, fake = make_app()
+    orders = {"a": 1.0, "b": math.nextafter(1.0, 2.0)}
+    rebalances = []
+
+    async def rest_request(method, path, access_token, params=None, json=None, headers=None):
+        if method == "GET":
+            rows = [_task_row(task_id, order=order) for task_id, order in orders.items()]
+            return SupabaseResponse(data=rows, headers=Headers({}))
+        if method == "POST":
+            rebalances.append((path, json))
+            orders.update(a=1024.0, b=2048.0)
+            return SupabaseResponse(data=2, headers=Headers({}))
+        return SupabaseResponse(data=[_task_row("t1", **json)], headers=Headers({}))
+
+    fake.rest_request = rest_request
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post("/tasks/t1/move", json={"beforeId": "a", "afterId": "b"})
+
+    assert response.status_code == 200
+    assert rebalances == [("rpc/rebalance_task_orders", {"step": 1024.0})]
+    assert response.json()["order"] == 1536.0
+
+
+@pytest.mark.asyncio
+async def test_move_task_rejects_neighbours_out_of_order(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(
+        data=[{"id": "a", "order": 2048.0}, {"id": "b", "order": 1024.0}], headers=Headers({})
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post("/tasks/t1/move", json={"beforeId": "a", "afterId": "b"})
+
+    assert response.status_code == 409
+    assert [(method, path) for method, path, *_ in fake.calls] == [("GET", "tasks")]
+
+
+@pytest.mark.asyncio
+async def test_create_task_renders_validated_model_with_created_status(make_app):
+    application, fake = make_app()
+    fake.rest_mapping[("POST", "tasks")] = SupabaseResponse(
+        data=[
+            {
+                "id": "t9",
+                "title": "Nueva",
+                "status": "sin_iniciar",
+                "due_date": "2024-02-01T10:00:00Z",
+                "add_to_calendar": True,
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-01T00:00:00Z",
+                "order": 1024.0,
+            }
+        ],
+        headers=Headers({}),
+    )
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.post(
+            "/tasks", json={"title": "Nueva", "status": "sin_iniciar", "order": 1024}
+        )
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert body["id"] == "t9"
+    assert body["dueDate"] == "2024-02-01T10:00:00Z"
+    assert body["addToCalendar"] is True
@@ -0,0 +1,69 @@
+import pytest
+from httpx import AsyncClient, Headers
+
+from app.core.timing import RequestTimings
+from app.db.supabase_client import SupabaseResponse
+
+
+def test_header_lists_known_phases_first_with_call_counts():
+    timings = RequestTimings()
+    timings.add("serialization", 0.0005)
+    timings.add("upstream", 0.010)
+    timings.add("upstream", 0.002)
+
+    entries = timings.header().split(", ")
+
+    assert entries[0] == 'upstream;dur=12.0;desc="2x"'
+    assert entries[1] == 'serialization;dur=0.5;desc="1x"'
+    assert entries[2].startswith("app;dur=")
+
+
+@pytest.mark.asyncio
+async def test_responses_carry_server_timing(make_app):
+    application, _ = make_app()
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/tasks")
+
+    header = response.headers["server-timing"]
+    assert "validation;dur=" in header
+    assert "serialization;dur=" in header
+    assert "app;dur=" in header
+
+
+@pytest.mark.asyncio
+async def test_single_row_reads_time_validation(make_app):
+    application, fake = make_app()
+    row = {
+        "id": "t1",
+        "title": "Declarar IVA",
+        "status": "sin_iniciar",
+        "order": 1024.0,
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+    fake.rest_mapping[("GET", "tasks")] = SupabaseResponse(data=[row], headers=Headers())
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/tasks/t1")
+
+    assert response.status_code == 200
+    assert "validation;dur=" in response.headers["server-timing"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("overrides", "expected"),
+    [
+        ({"server_timing_enabled": False}, False),
+        ({"app_env": "production"}, False),
+        ({"app_env": "production", "server_timing_enabled": True}, True),
+    ],
+)
+async def test_server_timing_defaults_off_outside_development(make_app, overrides, expected):
+    application, _ = make_app(**overrides)
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        client.cookies.set("sb-access-token", "token")
+        response = await client.get("/tasks")
+
+    assert ("server-timing" in response.headers) is expected
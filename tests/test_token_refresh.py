@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+from httpx import AsyncClient
+
+
+def _token(expires_in):
+    claims = {"sub": "user-1", "email": "user@example.com", "exp": int(time.time()) + expires_in}
+    return jwt.encode(claims, "unused-secret-for-unverified-decode-0123", algorithm="HS256")
+
+
+def _cookies(access_token):
+    return {"Cookie": f"sb-access-token={access_token}; sb-refresh-token=refresh-old"}
+
+
+def _app_with_counters(make_app):
+    application, fake = make_app()
+    application.state.supabase_client = fake
+    seen = {"refreshes": [], "tokens": []}
+
+    async def auth_refresh(refresh_token):
+        seen["refreshes"].append(refresh_token)
+        await asyncio.sleep(0.01)
+        return fake.refresh_payload
+
+    async def auth_get_user(access_token):
+        seen["tokens"].append(access_token)
+        return fake.user_payload
+
+    fake.auth_refresh = auth_refresh
+    fake.auth_get_user = auth_get_user
+    return application, seen
+
+
+@pytest.mark.asyncio
+async def test_expiring_token_is_refreshed_before_the_request(make_app):
+    application, seen = _app_with_counters(make_app)
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        response = await client.get("/auth/me", headers=_cookies(_token(expires_in=30)))
+
+    assert response.status_code == 200
+    assert seen == {"refreshes": ["refresh-old"], "tokens": ["access"]}
+    set_cookies = response.headers.get_list("set-cookie")
+    assert any(cookie.startswith("sb-access-token=access;") for cookie in set_cookies)
+    assert any(cookie.startswith("sb-refresh-token=refresh;") for cookie in set_cookies)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_refresh(make_app):
+    application, seen = _app_with_counters(make_app)
+    expiring = _token(expires_in=30)
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *[client.get("/auth/me", headers=_cookies(expiring)) for _ in range(5)]
+        )
+        # Arrives after the refresh finished, still carrying the rotated-out refresh token.
+        late = await client.get("/auth/me", headers=_cookies(expiring))
+
+    assert [response.status_code for response in responses + [late]] == [200] * 6
+    assert seen["refreshes"] == ["refresh-old"]
+    assert seen["tokens"] == ["access"] * 6
+
+
+@pytest.mark.asyncio
+async def test_fresh_and_opaque_tokens_are_left_alone(make_app):
+    application, seen = _app_with_counters(make_app)
+    fresh = _token(expires_in=3600)
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        first = await client.get("/auth/me", headers=_cookies(fresh))
+        second = await client.get("/auth/me", headers=_cookies("opaque-token"))
+
+    assert seen == {"refreshes": [], "tokens": [fresh, "opaque-token"]}
+    assert "set-cookie" not in first.headers
+    assert "set-cookie" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_refreshed_requests_keep_their_route_label(make_app):
+    application, _ = _app_with_counters(make_app)
+    async with AsyncClient(app=application, base_url="http://test") as client:
+        await client.get("/auth/me", headers=_cookies(_token(expires_in=30)))
+
+    rendered = application.state.metrics.render({})
+    assert 'method="GET",route="/auth/me",status="200"' in rendered
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from httpx import Headers
+
+from app.core.errors import AppError
+from app.db.supabase_client import SupabaseResponse
+from app.models.clients import Client
+from app.services.validation import validate_rows
+
+ROWS = [
+    {
+        "id": "c1",
+        "name_or_business": "ACME",
+        "identificacion": "900123",
+        "payment_state": "pagado",
+        "documents": [{"id": "d1", "name": "rut.pdf", "type": "pdf", "size_bytes": 10}],
+        "tax_profile": {"identificacion_tipo": "NIT", "ica_periodicidad": "anual"},
+    }
+]
+
+
+@pytest.mark.parametrize("mode", ["per_row", "list", "json"])
+def test_validate_rows_modes_agree(mode):
+    response = SupabaseResponse(headers=Headers(), content=json.dumps(ROWS).encode())
+
+    items = validate_rows(response, Client, mode)
+
+    assert items == [Client.model_validate(row) for row in ROWS]
+    assert items[0].documents[0].size_bytes == 10
+    assert items[0].tax_profile.ica_periodicidad.value == "anual"
+
+
+@pytest.mark.parametrize("mode", ["per_row", "list", "json"])
+@pytest.mark.parametrize("payload", [{"message": "not a list"}, [{"id": "c1"}]])
+def test_validate_rows_rejects_unexpected_payloads(mode, payload):
+    response = SupabaseResponse(headers=Headers(), content=json.dumps(payload).encode())
+
+    with pytest.raises(AppError) as excinfo:
+        validate_rows(response, Client, mode)
+
+    assert excinfo.value.status_code == 502
+
+
+def test_response_data_is_decoded_lazily():
+    response = SupabaseResponse(headers=Headers(), content=b'[{"id": 1}]')
+    assert response.data == [{"id": 1}]
+    assert SupabaseResponse(headers=Headers(), content=b"").data == {}
+    assert SupabaseResponse(data=[1], headers=Headers()).data == [1]